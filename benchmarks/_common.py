@@ -0,0 +1,11 @@
+# benchmarks/_common.py
+"""Helpers shared by the benchmarks; kept free of model / camera imports."""
+
+import subprocess
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except Exception:
+        return 'unknown'
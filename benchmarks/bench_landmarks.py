@@ -0,0 +1,65 @@
+# benchmarks/bench_landmarks.py
+"""
+Per-frame cost of converting MediaPipe pose landmarks to a float32 row.
+Run from the repo root: python -m benchmarks.bench_landmarks
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+from mediapipe.framework.formats import landmark_pb2
+
+from core.landmark_window import LandmarkWindow
+from core.landmarks import landmarks_into, NUM_LANDMARKS
+
+
+def make_pose_landmarks(csv_path):
+    """Builds a NormalizedLandmarkList from the first frame of a recorded CSV."""
+    row = pd.read_csv(csv_path, nrows=1).drop(columns=['label'], errors='ignore').values[0]
+    pose_landmarks = landmark_pb2.NormalizedLandmarkList()
+    for i in range(NUM_LANDMARKS):
+        lm = pose_landmarks.landmark.add()
+        lm.x, lm.y, lm.z = row[3 * i:3 * i + 3]
+        lm.visibility = 0.99
+    return pose_landmarks
+
+
+def legacy_extract(pose_landmarks):
+    return np.array([coord for lm in pose_landmarks.landmark for coord in (lm.x, lm.y, lm.z)], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--csv', default='data/collected_data/curls_good1.csv')
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    pose_landmarks = make_pose_landmarks(args.csv)
+    window = LandmarkWindow()
+    visibility = np.empty(NUM_LANDMARKS, dtype=np.float32)
+
+    def into_window():
+        landmarks_into(pose_landmarks, window.next_row())
+        window.commit()
+
+    def into_window_with_visibility():
+        landmarks_into(pose_landmarks, window.next_row(), visibility)
+        window.commit()
+
+    assert np.array_equal(legacy_extract(pose_landmarks), landmarks_into(pose_landmarks))
+
+    cases = {
+        'legacy list -> np.array': lambda: legacy_extract(pose_landmarks),
+        'landmarks_into (new array)': lambda: landmarks_into(pose_landmarks),
+        'landmarks_into window row': into_window,
+        'landmarks_into window row + visibility': into_window_with_visibility,
+    }
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        print(f"{name:<42} {best * 1e6:7.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
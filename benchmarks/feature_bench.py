@@ -0,0 +1,83 @@
+# benchmarks/feature_bench.py
+"""
+Compares the summary-feature classifiers against the LSTMs on the same test
+windows (classifier.input_pipeline.split_indices with the same seed): accuracy
+and single-window latency, feature extraction included.
+
+    python -m classifier.train_feature_classifier
+    python -m benchmarks.feature_bench
+
+The shipped LSTMs were trained before this split existed, so their accuracy
+here may include windows they were trained on; retrain them with the same
+seed for a strict comparison.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from keras.models import load_model
+
+from core.predictor import CompiledBackend, FeatureBackend, variant_path
+from classifier.input_pipeline import split_indices
+from classifier.tasks import TASKS, load_task
+from benchmarks._common import git_commit
+
+
+def accuracy(backend, dataset, labels, indices, chunk=512):
+    correct = 0
+    for start in range(0, len(indices), chunk):
+        batch = indices[start:start + chunk]
+        correct += int((backend.predict(dataset.gather(batch)).argmax(axis=1) == labels[batch]).sum())
+    return correct / len(indices)
+
+
+def latency(backend, dataset, indices, samples):
+    windows = dataset.gather(indices[:samples])
+    backend.predict(windows[:1])
+    timings = []
+    for window in windows:
+        x = window[None]
+        t0 = time.perf_counter()
+        backend.predict(x)
+        timings.append(time.perf_counter() - t0)
+    timings = np.array(timings) * 1e6
+    return round(float(np.median(timings)), 1), round(float(np.percentile(timings, 95)), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature classifiers vs LSTMs: accuracy and latency.")
+    parser.add_argument('--tasks', nargs='*', default=list(TASKS))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--samples', type=int, default=300, help="windows timed one at a time per model")
+    parser.add_argument('--output', help="JSON output path")
+    args = parser.parse_args()
+
+    results = {'meta': {'commit': git_commit(), 'seed': args.seed}, 'tasks': {}}
+    for task in args.tasks:
+        dataset, labels, _ = load_task(task)
+        _, test_idx = split_indices(dataset, labels, random_state=args.seed)
+        model_path = TASKS[task][0]
+        backends = {
+            'lstm': CompiledBackend(load_model(model_path)),
+            'features': FeatureBackend(variant_path(model_path, 'features')),
+        }
+        results['tasks'][task] = {}
+        for name, backend in backends.items():
+            p50, p95 = latency(backend, dataset, test_idx, args.samples)
+            stats = {'accuracy': round(accuracy(backend, dataset, labels, test_idx), 4),
+                     'p50_us': p50, 'p95_us': p95}
+            results['tasks'][task][name] = stats
+            print(f"{task:<8} {name:<9} accuracy {stats['accuracy']:.3f} | p50 {p50:>9.1f} us | p95 {p95:>9.1f} us")
+
+    output = args.output or os.path.join('benchmarks', 'results', f"features_{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
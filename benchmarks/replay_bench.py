@@ -0,0 +1,226 @@
+# benchmarks/replay_bench.py
+"""
+Replays the recorded landmark CSVs frame by frame through the per-frame hot
+loop (window buffer, pose features, both LSTM classifiers and the rep-counting
+state machines) without a webcam, and reports throughput, per-frame latency
+percentiles and memory allocated per frame.
+
+    python -m benchmarks.replay_bench
+    python -m benchmarks.replay_bench --limit 20 --compare benchmarks/results/replay_abc1234.json
+
+Results are written as JSON (default: benchmarks/results/replay_<commit>.json)
+so runs can be compared across commits. Allocation figures come from
+tracemalloc and only cover Python / numpy allocations, not TensorFlow's.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from core.landmark_window import LandmarkWindow
+from core.pose_features import PoseFeatures
+from core.predictor import (workout_backend, load_classifier, INFERENCE_BACKEND,
+                            FORM_MODEL_PATH, FORM_LABEL_ENCODER_PATH)
+from core.trackers import WorkoutTracker, FreeForAllTracker, WORKOUT_CONFIG
+from benchmarks._common import git_commit
+
+REPLAY_FPS = 30.0
+
+
+def load_recordings(pattern, limit=None):
+    """Returns [(path, frames (n, 99) float32, label)] for every readable CSV."""
+    recordings = []
+    for path in sorted(glob.glob(pattern))[:limit]:
+        df = pd.read_csv(path)
+        label = str(df['label'].iloc[0]) if 'label' in df.columns else None
+        values = df.drop(columns=['label'], errors='ignore').apply(pd.to_numeric, errors='coerce').dropna()
+        recordings.append((path, np.ascontiguousarray(values.values, dtype=np.float32), label))
+    return recordings
+
+
+class ReplayClock:
+    def __init__(self):
+        self.frame_index = 0
+
+    def __call__(self):
+        return self.frame_index / REPLAY_FPS
+
+
+def make_components(form_model, form_label_encoder):
+    """Each component maps (label, clock) -> step(row) for one recording."""
+
+    def window(label, clock):
+        buf = LandmarkWindow()
+
+        def step(row):
+            buf.push(row)
+            buf.batch()
+        return step
+
+    def features(label, clock):
+        pose_features = PoseFeatures(velocities=True)
+
+        def step(row):
+            pose_features.update(row, clock())
+        return step
+
+    def classifier(backend):
+        def make(label, clock):
+            buf = LandmarkWindow()
+
+            def step(row):
+                buf.push(row)
+                if buf.full:
+                    backend.predict(buf.batch())
+            return step
+        return make
+
+    def rep_counter(label, clock):
+        # collected_data labels are exercise names, collected_data_goodbad ones add good/bad
+        workout_type = (label or '').replace('good', '').replace('bad', '')
+        if workout_type not in WORKOUT_CONFIG:
+            workout_type = 'curls'
+        return WorkoutTracker(workout_type, form_model, form_label_encoder, clock=clock).update_row
+
+    def free_for_all(label, clock):
+        return FreeForAllTracker(form_model, form_label_encoder, clock=clock).update_row
+
+    return {
+        'window': window,
+        'features': features,
+        'workout_classifier': classifier(workout_backend),
+        'form_classifier': classifier(form_model),
+        'rep_counter': rep_counter,
+        'free_for_all': free_for_all,
+    }
+
+
+def time_component(make_step, recordings):
+    latencies = []
+    clock = ReplayClock()
+    started = time.perf_counter()
+    for _, frames, label in recordings:
+        step = make_step(label, clock)
+        for i, row in enumerate(frames):
+            clock.frame_index = i
+            t0 = time.perf_counter()
+            step(row)
+            latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    latencies = np.array(latencies) * 1000.0
+    return {
+        'frames': int(len(latencies)),
+        'frames_per_s': round(len(latencies) / total, 1) if total else None,
+        'mean_ms': round(float(latencies.mean()), 4),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 4),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 4),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 4),
+        'max_ms': round(float(latencies.max()), 4),
+    }
+
+
+def measure_allocations(make_step, recordings, max_frames):
+    """Mean peak bytes allocated while processing one frame, and mean bytes still held afterwards."""
+    clock = ReplayClock()
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for _, frames, label in recordings:
+            step = make_step(label, clock)
+            for i, row in enumerate(frames):
+                if len(peaks) >= max_frames:
+                    break
+                clock.frame_index = i
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                step(row)
+                current, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+                retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        'alloc_bytes_per_frame': round(float(np.mean(peaks)), 1) if peaks else None,
+        'retained_bytes_per_frame': round(float(np.mean(retained)), 1) if retained else None,
+    }
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} ({baseline['meta']['commit']}):")
+    for name, stats in results['components'].items():
+        old = baseline['components'].get(name)
+        if not old:
+            continue
+        change = (stats['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100.0 if old['p50_ms'] else 0.0
+        print(f"  {name:<20} p50 {old['p50_ms']:.4f} -> {stats['p50_ms']:.4f} ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay benchmark over recorded landmark CSVs.")
+    parser.add_argument('--data', default='data/collected_data/*.csv')
+    parser.add_argument('--limit', type=int, default=None, help="replay only the first N recordings")
+    parser.add_argument('--components', nargs='*', help="subset of components to run")
+    parser.add_argument('--alloc-frames', type=int, default=300, help="frames per component traced for allocations")
+    parser.add_argument('--output', help="JSON output path")
+    parser.add_argument('--compare', help="previous JSON result to compare against")
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.data, args.limit)
+    if not recordings:
+        raise SystemExit(f"No recordings match {args.data}")
+    print(f"Replaying {len(recordings)} recordings ({sum(len(r[1]) for r in recordings)} frames)")
+
+    form_model = load_classifier(FORM_MODEL_PATH)
+    form_label_encoder = joblib.load(FORM_LABEL_ENCODER_PATH)
+    components = make_components(form_model, form_label_encoder)
+    selected = args.components or list(components)
+
+    commit = git_commit()
+    results = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'backend': INFERENCE_BACKEND,
+            'recordings': len(recordings),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'components': {},
+    }
+    for name in selected:
+        # Trackers print every rep; keep that out of the timings' output.
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = time_component(components[name], recordings)
+            stats.update(measure_allocations(components[name], recordings, args.alloc_frames))
+        results['components'][name] = stats
+        print(f"{name:<20} {stats['frames_per_s']:>10} frames/s | p50 {stats['p50_ms']:.4f} ms | "
+              f"p95 {stats['p95_ms']:.4f} ms | p99 {stats['p99_ms']:.4f} ms | "
+              f"{stats['alloc_bytes_per_frame']} B alloc/frame")
+
+    output = args.output or os.path.join('benchmarks', 'results', f"replay_{commit}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
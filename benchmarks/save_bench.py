@@ -0,0 +1,109 @@
+# benchmarks/save_bench.py
+"""
+Workout-save throughput against the Firestore emulator: the current
+single-write increment save (utils.data_logger.save_workout_data) against the
+previous read-then-overwrite save, sequentially and with several writers
+hitting the same user-day at once. Reports saves/s, latency percentiles and
+lost updates (expected minus stored pushups after all writers finish).
+
+    gcloud emulators firestore start --host-port=localhost:8080
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m benchmarks.save_bench
+
+Refuses to run without FIRESTORE_EMULATOR_HOST so it never writes to a real
+project. Results go to benchmarks/results/saves_<commit>.json.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from firebase_admin import firestore
+
+from utils.data_logger import save_workout_data, COUNTED_FIELDS
+from utils.workout_store import COLLECTION, doc_id
+from benchmarks._common import git_commit
+
+SESSION = {"pushups": 10, "pushups_good": 8, "pushups_bad": 2, "squats": 5, "squats_good": 5}
+
+
+def legacy_save(user_id, reps_dict, calories, duration, plank_time=None, client=None):
+    """The read-modify-write save this benchmark compares against (two round trips, last writer wins)."""
+    doc_ref = client.collection(COLLECTION).document(doc_id(user_id, datetime.today()))
+    existing = doc_ref.get().to_dict() or {}
+    updated = {key: existing.get(key, 0) + reps_dict.get(key, 0) for key in COUNTED_FIELDS}
+    updated["plank_time"] = existing.get("plank_time", 0) + (plank_time or 0)
+    updated["total_reps"] = existing.get("total_reps", 0) + sum(
+        reps_dict.get(k, 0) for k in ['pushups', 'squats', 'curls', 'situps'])
+    updated["calories"] = round(existing.get("calories", 0) + calories, 1)
+    updated["duration"] = existing.get("duration", 0) + duration
+    updated["timestamp"] = datetime.now()
+    doc_ref.set(updated)
+
+
+SAVES = {'increment': save_workout_data, 'legacy': legacy_save}
+
+
+def run(save, client, saves, writers):
+    """Runs `saves` saves for one fresh user, spread over `writers` threads."""
+    user_id = f"bench_{uuid.uuid4().hex[:8]}"
+    timings = []
+    lock = threading.Lock()
+
+    def one(_):
+        t0 = time.perf_counter()
+        save(user_id, SESSION, calories=12.5, duration=3, client=client)
+        with lock:
+            timings.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(one, range(saves)))
+    elapsed = time.perf_counter() - t0
+
+    doc = client.collection(COLLECTION).document(doc_id(user_id, datetime.today())).get().to_dict() or {}
+    timings = np.array(timings) * 1000.0
+    return {
+        'saves_per_s': round(saves / elapsed, 1),
+        'p50_ms': round(float(np.median(timings)), 2),
+        'p95_ms': round(float(np.percentile(timings, 95)), 2),
+        'lost_updates': (saves * SESSION['pushups'] - doc.get('pushups', 0)) // SESSION['pushups'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workout save throughput against the Firestore emulator.")
+    parser.add_argument('--saves', type=int, default=200)
+    parser.add_argument('--writers', type=int, nargs='*', default=[1, 8])
+    parser.add_argument('--project', default='ai-fitness-bench')
+    parser.add_argument('--output', help="JSON output path")
+    args = parser.parse_args()
+
+    if not os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        raise SystemExit("Set FIRESTORE_EMULATOR_HOST to a running Firestore emulator (e.g. localhost:8080)")
+    client = firestore.Client(project=args.project)
+
+    results = {'meta': {'commit': git_commit(), 'saves': args.saves,
+                        'emulator': os.environ['FIRESTORE_EMULATOR_HOST']}, 'runs': {}}
+    for name, save in SAVES.items():
+        for writers in args.writers:
+            stats = run(save, client, args.saves, writers)
+            results['runs'][f"{name}_{writers}"] = stats
+            print(f"{name:<9} {writers:>2} writers | {stats['saves_per_s']:>7.1f} saves/s | "
+                  f"p50 {stats['p50_ms']:>6.2f} ms | p95 {stats['p95_ms']:>6.2f} ms | "
+                  f"lost {stats['lost_updates']}")
+
+    output = args.output or os.path.join('benchmarks', 'results', f"saves_{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
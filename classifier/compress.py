@@ -0,0 +1,177 @@
+# classifier/compress.py
+"""
+Compressed variants of the LSTM classifiers, plus a report comparing them.
+
+    python -m classifier.compress --task workout
+    python -m classifier.compress --task form --student-units 32 --temperature 3
+
+Writes next to the original .keras model:
+    <model>.float16.tflite   float16 weights
+    <model>.int8.tflite      full-integer int8 (falls back to int8 weights / float
+                             activations if the LSTM cannot be fully quantized)
+    <model>.student.keras    smaller LSTM distilled from the teacher's soft labels
+
+Every variant (and the original) is evaluated on held-out recordings (whole
+recordings, not windows) for accuracy, file size and single-sample latency.
+The teacher itself was trained on a window-level split, so it has likely seen
+those recordings; the report is a relative comparison between variants.
+
+The runtime picks a variant with AI_FITNESS_MODEL_VARIANT=float16|int8|student.
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from keras.callbacks import EarlyStopping
+from keras.models import load_model
+from keras.utils import to_categorical
+from sklearn.model_selection import GroupShuffleSplit
+
+from core.model_utils import build_model, SEQUENCE_LENGTH, FEATURE_COUNT
+from core.model_paths import variant_path
+from classifier.input_pipeline import make_dataset, NOISE_STD
+from classifier.tasks import TASKS, load_task
+
+REPRESENTATIVE_WINDOWS = 200
+
+
+def split_by_recording(dataset, indices, test_size, seed):
+    """Splits window indices into two sets that share no recording."""
+    splitter = GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=seed)
+    train, test = next(splitter.split(indices, groups=dataset.recording_ids[indices]))
+    return indices[train], indices[test]
+
+
+def export_quantized(model, model_path, dataset, train_idx, seed):
+    """Writes the float16 and int8 variants; returns {variant: quantization actually used}."""
+    from core.predictor import export_tflite
+
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(train_idx, size=min(REPRESENTATIVE_WINDOWS, len(train_idx)), replace=False)
+    representative = [window[None] for window in dataset.gather(sample)]
+
+    used = {}
+    export_tflite(model, variant_path(model_path, 'float16'), 'float16')
+    used['float16'] = 'float16'
+    try:
+        export_tflite(model, variant_path(model_path, 'int8'), 'int8', representative)
+        used['int8'] = 'int8'
+    except Exception as e:
+        print(f"Full integer quantization failed ({e}); exporting int8 weights with float activations")
+        export_tflite(model, variant_path(model_path, 'int8'), 'dynamic')
+        used['int8'] = 'dynamic'
+    return used
+
+
+def distill(teacher, dataset, y, train_idx, seed, lstm_units, dense_units, temperature, alpha, epochs):
+    """
+    Trains a smaller student on alpha * teacher soft labels (at the given
+    temperature) + (1 - alpha) * the true labels.
+    """
+    train_idx, val_idx = split_by_recording(dataset, train_idx, 0.1, seed)
+    probs = teacher.predict(make_dataset(dataset, y, train_idx), verbose=0)
+    logits = np.log(np.clip(probs, 1e-7, 1.0)) / temperature
+    soft = np.exp(logits - logits.max(axis=1, keepdims=True))
+    soft /= soft.sum(axis=1, keepdims=True)
+
+    targets = y.astype(np.float32).copy()
+    targets[train_idx] = alpha * soft + (1.0 - alpha) * y[train_idx]
+
+    dropout = (0.4,) * (len(lstm_units) - 1) + (0.5,)
+    student = build_model((SEQUENCE_LENGTH, FEATURE_COUNT), y.shape[1], lstm_units=lstm_units,
+                          dropout=dropout, dense_units=dense_units)
+    train_ds = make_dataset(dataset, targets, train_idx, noise_std=NOISE_STD, shuffle=True, jitter=True, seed=seed)
+    val_ds = make_dataset(dataset, y, val_idx)
+    early_stop = EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)
+    student.fit(train_ds, epochs=epochs, validation_data=val_ds, callbacks=[early_stop])
+    return student
+
+
+def evaluate(backend, dataset, y, test_idx, chunk=256):
+    """Accuracy over test windows fed one at a time, and the median per-sample latency in ms."""
+    correct = 0
+    timings = []
+    for start in range(0, len(test_idx), chunk):
+        batch = test_idx[start:start + chunk]
+        windows = dataset.gather(batch)
+        for window, target in zip(windows, y[batch]):
+            x = window[None]
+            t0 = time.perf_counter()
+            probs = backend.predict(x)
+            timings.append(time.perf_counter() - t0)
+            correct += int(np.argmax(probs) == np.argmax(target))
+    return correct / len(test_idx), float(np.median(timings) * 1000.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize and distill the LSTM classifiers and compare the variants.")
+    parser.add_argument('--task', choices=list(TASKS), default='workout')
+    parser.add_argument('--data', help="CSV glob/directory or dataset store (default depends on --task)")
+    parser.add_argument('--stride', type=int, default=1)
+    parser.add_argument('--test-size', type=float, default=0.2, help="fraction of recordings held out")
+    parser.add_argument('--student-units', type=int, nargs='+', default=[32], help="student LSTM layer sizes")
+    parser.add_argument('--student-dense', type=int, default=32)
+    parser.add_argument('--temperature', type=float, default=2.0)
+    parser.add_argument('--alpha', type=float, default=0.7, help="weight of the teacher's soft labels")
+    parser.add_argument('--epochs', type=int, default=25)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="report CSV (default: classifier/sweeps/compress_<task>_<timestamp>.csv)")
+    args = parser.parse_args()
+
+    # Imported here: core.predictor loads and verifies the shipped workout model on import.
+    from core.predictor import CompiledBackend, TFLiteBackend
+
+    model_path = TASKS[args.task][0]
+    # Encode with the shipped encoder so class indices match the teacher's outputs.
+    dataset, labels, label_encoder = load_task(args.task, args.data, args.stride)
+    y = to_categorical(labels, len(label_encoder.classes_))
+    train_idx, test_idx = split_by_recording(dataset, np.arange(len(dataset)), args.test_size, args.seed)
+    print(f"{len(train_idx)} training / {len(test_idx)} held-out windows")
+
+    teacher = load_model(model_path)
+    quantization = export_quantized(teacher, model_path, dataset, train_idx, args.seed)
+    student = distill(teacher, dataset, y, train_idx, args.seed, tuple(args.student_units), args.student_dense,
+                      args.temperature, args.alpha, args.epochs)
+    student_path = variant_path(model_path, 'student')
+    student.save(student_path)
+    print(f"Saved {student_path}")
+
+    variants = [
+        ('original', model_path, CompiledBackend(teacher), 'float32'),
+        ('float16', variant_path(model_path, 'float16'),
+         TFLiteBackend(teacher, model_path, variant_path(model_path, 'float16')), quantization['float16']),
+        ('int8', variant_path(model_path, 'int8'),
+         TFLiteBackend(teacher, model_path, variant_path(model_path, 'int8')), quantization['int8']),
+        ('student', student_path, CompiledBackend(student), 'float32'),
+    ]
+    rows = []
+    for name, path, backend, kind in variants:
+        accuracy, latency = evaluate(backend, dataset, y, test_idx)
+        rows.append({
+            'variant': name,
+            'quantization': kind,
+            'accuracy': round(accuracy, 4),
+            # For the TFLite variants the file is the flatbuffer itself; their parameter
+            # count is the teacher's, so only the Keras models report one.
+            'size_kb': round(os.path.getsize(path) / 1024.0, 1),
+            'params': int(backend.model.count_params()) if path.endswith('.keras') else None,
+            'latency_ms': round(latency, 3),
+            'path': path,
+        })
+    report = pd.DataFrame(rows)
+    print()
+    print(report.drop(columns=['path']).to_string(index=False))
+
+    output = args.output or os.path.join(
+        'classifier', 'sweeps', f"compress_{args.task}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    report.to_csv(output, index=False)
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# classifier/dataset_store.py
+"""
+Binary landmark dataset store.
+
+A store is a directory holding
+    frames.f32   every recording's cleaned frames back to back, float32, row-major (N, 99)
+    index.json   {"feature_count": 99, "recordings": [{"file", "label", "frames", "offset"}, ...]}
+
+Training loaders open frames.f32 with np.memmap, so loading takes a fraction
+of a second and only the pages actually used are read from disk.
+
+Convert a directory of recordings (CSV, or .lmk from the data collector):
+    python -m classifier.dataset_store data/collected_data data/store/collected_data
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.landmarks import FEATURE_COUNT
+
+RECORDING_EXTENSIONS = ('.csv', '.lmk')
+FRAMES_FILE = "frames.f32"
+INDEX_FILE = "index.json"
+
+
+def is_store(path):
+    return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+
+def find_recordings(directory):
+    """Every recording file (CSV or .lmk) directly inside directory."""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.endswith(RECORDING_EXTENSIONS))
+
+
+def read_recording(path):
+    """
+    Parses one CSV recording the same way the training loaders always have:
+    non-numeric values become NaN and those rows are dropped. A .lmk recording
+    from core.recording is read directly (rows with non-finite values dropped).
+    Returns (frames float32 (n, 99), label or None, dropped_rows).
+    """
+    if path.endswith('.lmk'):
+        from core.recording import read_recording_file
+
+        records, meta = read_recording_file(path)
+        landmarks = records['landmarks']
+        valid = np.isfinite(landmarks).all(axis=1)
+        return np.ascontiguousarray(landmarks[valid], dtype=np.float32), meta.get('label'), int((~valid).sum())
+
+    df = pd.read_csv(path)
+    label = df['label'].iloc[0] if 'label' in df.columns and len(df) else None
+    pose_cols = [col for col in df.columns if col != 'label']
+    values = df[pose_cols].apply(pd.to_numeric, errors='coerce')
+    valid = values.notnull().all(axis=1)
+    frames = np.ascontiguousarray(values[valid].values, dtype=np.float32)
+    return frames, label, int((~valid).sum())
+
+
+def build_store(csv_paths, out_dir, workers=None):
+    """
+    Writes every readable recording in csv_paths into a store at out_dir and returns the index.
+    Files are parsed in parallel through classifier.ingest, so unchanged ones come from its cache.
+    """
+    from classifier.ingest import ingest, print_report
+
+    os.makedirs(out_dir, exist_ok=True)
+    frames_path = os.path.join(out_dir, FRAMES_FILE)
+    records = ingest(csv_paths, workers)
+    print_report(records)
+    recordings = []
+    offset = 0
+    with open(frames_path + ".tmp", "wb") as out:
+        for record in records:
+            if record['error']:
+                continue
+            frames = record['values']
+            if frames.shape[1] != FEATURE_COUNT:
+                print(f"Skipping {record['file']}: expected {FEATURE_COUNT} features, got {frames.shape[1]}")
+                continue
+            out.write(np.ascontiguousarray(frames).tobytes())
+            recordings.append({
+                'file': os.path.basename(record['file']),
+                'label': record['label'],
+                'frames': int(len(frames)),
+                'offset': offset,
+            })
+            offset += len(frames)
+
+    index = {'feature_count': FEATURE_COUNT, 'total_frames': offset, 'recordings': recordings}
+    os.replace(frames_path + ".tmp", frames_path)
+    with open(os.path.join(out_dir, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+class LandmarkStore:
+    """Read-only view of a store; recording frames are slices of one memory-mapped array."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            self.index = json.load(f)
+        self.recordings = self.index['recordings']
+        feature_count = self.index['feature_count']
+        total = self.index['total_frames']
+        if total:
+            self.frames = np.memmap(os.path.join(path, FRAMES_FILE), dtype=np.float32, mode='r',
+                                    shape=(total, feature_count))
+        else:
+            self.frames = np.zeros((0, feature_count), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.recordings)
+
+    def recording(self, i):
+        """(frames view, label) of the i-th recording."""
+        entry = self.recordings[i]
+        start = entry['offset']
+        return self.frames[start:start + entry['frames']], entry['label']
+
+    def __iter__(self):
+        for i in range(len(self.recordings)):
+            yield self.recording(i)
+
+
+def open_store(path):
+    return LandmarkStore(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert landmark recordings into a memory-mapped store.")
+    parser.add_argument('source', help="directory of CSV / .lmk recordings")
+    parser.add_argument('out_dir', help="store directory to write")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: all cores)")
+    args = parser.parse_args()
+
+    index = build_store(find_recordings(args.source), args.out_dir, args.workers)
+    print(f"Wrote {len(index['recordings'])} recordings ({index['total_frames']} frames) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
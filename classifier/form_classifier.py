@@ -1,112 +1,110 @@
+import argparse
 import os
-import numpy as np
-import pandas as pd
 from sklearn.preprocessing import LabelEncoder
-from sklearn.model_selection import train_test_split
-from keras.models import Sequential
-from keras.layers import LSTM, Dense, Dropout
 from keras.utils import to_categorical
 from keras.callbacks import EarlyStopping
 
-WINDOW_SIZE = 30
-FEATURE_COUNT = 99
+from core.model_utils import build_model
+from classifier.dataset_store import is_store, open_store, find_recordings
+from classifier.ingest import ingest, print_report
+from classifier.window_dataset import WindowDataset
+from classifier.input_pipeline import split_datasets
+from classifier.manifest import add_selection_arguments, selected_files
+from classifier.train_metrics import TrainingProfiler, profile_phase
+from core.landmark_window import SEQUENCE_LENGTH, FEATURE_COUNT
 DATA_DIR = 'collected_data_goodbad'
 
-def load_data():
-    X = []
-    y = []
-
-    for filename in os.listdir(DATA_DIR):
-        if not filename.endswith(".csv"):
-            continue
-
-        filepath = os.path.join(DATA_DIR, filename)
-        df = pd.read_csv(filepath)
-
-        if 'label' in df.columns:
-            df_features = df.drop(columns=['label'])
-        else:
-            df_features = df
-
-        if df_features.shape[1] != FEATURE_COUNT:
-            print(f"⛔ Skipped {filename} — wrong number of features (expected {FEATURE_COUNT}, got {df_features.shape[1]})")
-            continue
-
-        if df_features.shape[0] < WINDOW_SIZE:
-            print(f"⛔ Skipped {filename} — only {df_features.shape[0]} frames (need ≥ {WINDOW_SIZE})")
-            continue
-
-        for start in range(df_features.shape[0] - WINDOW_SIZE + 1):
-            window = df_features.iloc[start:start + WINDOW_SIZE].values
-            X.append(window)
-
-            if 'label' in df.columns:
-                label_series = df['label']
-                label = label_series.iloc[0] 
-                y.append(label)
-            else:
-                print(f"⚠️ Skipped {filename} — no 'label' column found")
+def _check_recording(name, label, feature_count, frame_count):
+    if feature_count != FEATURE_COUNT:
+        print(f"⛔ Skipped {name} — wrong number of features (expected {FEATURE_COUNT}, got {feature_count})")
+        return False
+    if frame_count < SEQUENCE_LENGTH:
+        print(f"⛔ Skipped {name} — only {frame_count} frames (need ≥ {SEQUENCE_LENGTH})")
+        return False
+    if label is None:
+        print(f"⚠️ Skipped {name} — no 'label' column found")
+        return False
+    return True
+
+
+def _store_dataset(data_dir, stride, files=None, profiler=None):
+    with profile_phase(profiler, 'load'):
+        store = open_store(data_dir)
+        keep = [i for i, entry in enumerate(store.recordings)
+                if (files is None or entry['file'] in files) and _check_recording(entry['file'], entry['label'], store.frames.shape[1], entry['frames'])]
+    with profile_phase(profiler, 'window'):
+        return WindowDataset.from_store(store, SEQUENCE_LENGTH, stride, recordings=keep)
+
+
+def _csv_dataset(data_dir, stride, files=None, profiler=None, update_cache=True):
+    with profile_phase(profiler, 'load'):
+        paths = [path for path in find_recordings(data_dir) if files is None or os.path.basename(path) in files]
+        records = ingest(paths, update_cache=update_cache)
+        print_report(records)
+        recordings = []
+        for record in records:
+            if record['error']:
                 continue
-
-
-    if len(X) == 0:
+            frames, label = record['values'], record['label']
+            if _check_recording(os.path.basename(record['file']), label, frames.shape[1], len(frames)):
+                recordings.append((frames, label))
+    with profile_phase(profiler, 'window'):
+        return WindowDataset.from_recordings(recordings, SEQUENCE_LENGTH, stride)
+
+
+def load_data(data_dir=DATA_DIR, stride=1, files=None, profiler=None, update_cache=True):
+    """
+    data_dir is a directory of CSV / .lmk recordings or a classifier.dataset_store store.
+    files optionally limits loading to these file names (see classifier.manifest.select).
+    Returns (dataset, y_categorical, label_encoder) with a WindowDataset of every
+    `stride`-th window; windows are copied out per batch with dataset.gather().
+    profiler: optional classifier.train_metrics.TrainingProfiler timing the load and window phases.
+    update_cache=False only reads the parse cache (see classifier.ingest.ingest).
+    """
+    if is_store(data_dir):
+        dataset = _store_dataset(data_dir, stride, files, profiler)
+    else:
+        dataset = _csv_dataset(data_dir, stride, files, profiler, update_cache)
+
+    if len(dataset) == 0:
         raise ValueError("No valid samples found.")
 
-    X = np.array(X)
-    y = np.array(y)
-
     # Encode labels to one-hot vectors
     le = LabelEncoder()
-    y_encoded = le.fit_transform(y)
+    y_encoded = le.fit_transform(dataset.window_labels)
     y_categorical = to_categorical(y_encoded)
 
     print("Form classifier label classes:", le.classes_)
 
 
-    print(f"Loaded {X.shape[0]} samples with shape {X.shape[1:]} features")
+    print(f"Loaded {len(dataset)} samples with shape {dataset.shape[1:]} features")
     print(f"Labels: {list(le.classes_)}")
-    return X, y_categorical, le
-
-def build_model(input_shape, num_classes):
-    model = Sequential([
-        LSTM(64, return_sequences=True, input_shape=input_shape),
-        Dropout(0.4),
-
-        LSTM(64, return_sequences=True),
-        Dropout(0.4),
-
-        LSTM(32),
-        Dropout(0.5),
-
-        Dense(64, activation='relu'),
-        Dropout(0.4),
-
-        Dense(num_classes, activation='softmax')
-    ])
-
-    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
-    return model
+    return dataset, y_categorical, le
 
 def main():
-    X, y, label_encoder = load_data()
+    parser = argparse.ArgumentParser(description="Train the form classifier.")
+    parser.add_argument('data_dir', nargs='?', default=DATA_DIR, help="CSV directory or dataset store")
+    parser.add_argument('--stride', type=int, default=1, help="frames between consecutive training windows")
+    add_selection_arguments(parser)
+    args = parser.parse_args()
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, stratify=y, test_size=0.2, random_state=42
-    )
+    profiler = TrainingProfiler('form')
+    files = selected_files(args.data_dir, args.exercise, args.form, args.side, args.balanced, args.stride)
+    dataset, y, label_encoder = load_data(args.data_dir, args.stride, files, profiler)
 
-    model = build_model(input_shape=(WINDOW_SIZE, FEATURE_COUNT), num_classes=y.shape[1])
+    train_ds, val_ds = split_datasets(dataset, y, test_size=0.2, random_state=42, profiler=profiler)
 
-    noise = np.random.normal(0, 0.003, X_train.shape)
-    X_train_noisy = X_train + noise
+    model = build_model(input_shape=(SEQUENCE_LENGTH, FEATURE_COUNT), num_classes=y.shape[1])
 
     early_stop = EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)
 
     model.fit(
-        X_train_noisy, y_train,
+        train_ds,
         epochs=25,
-        validation_data=(X_test, y_test),
-        callbacks=[early_stop]
+        validation_data=val_ds,
+        callbacks=[early_stop, profiler.callback()]
     )
+    profiler.close()
 
     model.save("form_classifier_model.keras")
     import joblib
@@ -0,0 +1,177 @@
+# classifier/ingest.py
+"""
+Parallel, cached parsing of CSV landmark recordings.
+
+Each file's cleaned float32 frames are cached under data/.cache/parsed as
+<sha1 of contents>.npy (+ .json with label and cleaning stats). A file whose
+path, size and mtime match the cache index is not even re-hashed; a touched
+or renamed file with unchanged contents is re-hashed but not re-parsed. Only
+new or modified files are parsed, spread over a process pool. Cache files
+are written to a unique temporary file and renamed into place, so processes
+sharing the cache (the sweep's workers) never see or clobber a partial write.
+
+    records = ingest(glob.glob('data/collected_data/*.csv'), min_frames=30)
+    print_report(records)
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from classifier.dataset_store import read_recording
+
+CACHE_DIR = os.path.join('data', '.cache', 'parsed')
+INDEX_FILE = 'index.json'
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write, mode='w'):
+    """Writes through write(f) to a temporary file next to path, then renames it over path."""
+    with tempfile.NamedTemporaryFile(mode, dir=os.path.dirname(path) or '.', suffix='.tmp', delete=False) as f:
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+
+def _parse(path):
+    try:
+        frames, label, dropped = read_recording(path)
+    except Exception as e:
+        return path, None, None, 0, str(e)
+    return path, frames, None if label is None else str(label), dropped, None
+
+
+class ParseCache:
+    """Content-addressed cache of parsed recordings, with a (path, size, mtime) -> hash index."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, INDEX_FILE)
+        self._dirty = False
+        try:
+            with open(self._index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _paths(self, digest):
+        base = os.path.join(self.cache_dir, digest)
+        return base + '.npy', base + '.json'
+
+    def lookup(self, path):
+        """Returns (digest, (frames, meta)) for a cached file, or (digest, None) when it must be parsed."""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.index.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            digest = entry['sha1']
+        else:
+            digest = file_hash(path)
+            self.index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': digest}
+            self._dirty = True
+        array_path, meta_path = self._paths(digest)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            return digest, (np.load(array_path, mmap_mode='r'), meta)
+        except (OSError, ValueError):
+            return digest, None
+
+    def store(self, digest, frames, meta):
+        array_path, meta_path = self._paths(digest)
+        # The array goes first: lookup() treats a digest as cached once its meta file exists.
+        _write_atomic(array_path, lambda f: np.save(f, frames), 'wb')
+        _write_atomic(meta_path, lambda f: json.dump(meta, f))
+
+    def save_index(self):
+        """Writes the index if lookup() added or changed entries."""
+        if not self._dirty:
+            return
+        _write_atomic(self._index_path, lambda f: json.dump(self.index, f))
+        self._dirty = False
+
+
+def ingest(paths, workers=None, min_frames=0, cache_dir=CACHE_DIR, update_cache=True):
+    """
+    Parses (or loads from the cache) every CSV in paths.
+    Returns one dict per file, in sorted path order:
+        file, label, values (frames float32 array or None), rows, dropped_rows,
+        cached (bool), skipped (reason or None), error (message or None)
+    Files with fewer than min_frames valid frames are marked skipped.
+    With update_cache=False the cache is only read: misses are parsed but not stored.
+    """
+    cache = ParseCache(cache_dir)
+    records = {}
+    pending = {}
+    for path in sorted(paths):
+        digest, hit = cache.lookup(path)
+        if hit is None:
+            pending[path] = digest
+            continue
+        frames, meta = hit
+        records[path] = {'file': path, 'label': meta['label'], 'values': frames,
+                         'rows': meta['rows'], 'dropped_rows': meta['dropped_rows'],
+                         'cached': True, 'skipped': None, 'error': None}
+
+    if pending:
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            # spawn: callers (the training scripts) may already have TensorFlow loaded.
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                parsed = list(pool.map(_parse, list(pending), chunksize=4))
+        else:
+            parsed = [_parse(path) for path in pending]
+
+        for path, frames, label, dropped, error in parsed:
+            record = {'file': path, 'label': label, 'values': frames, 'rows': 0, 'dropped_rows': dropped,
+                      'cached': False, 'skipped': None, 'error': error}
+            if error is None:
+                record['rows'] = len(frames) + dropped
+            if error is None and update_cache:
+                cache.store(pending[path], frames, {'label': label, 'rows': record['rows'], 'dropped_rows': dropped})
+            records[path] = record
+    if update_cache:
+        cache.save_index()
+
+    for record in records.values():
+        if record['error'] is None and len(record['values']) < min_frames:
+            record['skipped'] = f"too few valid frames ({len(record['values'])})"
+    return [records[path] for path in sorted(records)]
+
+
+def print_report(records):
+    """Per-file cleaning stats for files that needed attention, then totals."""
+    for record in records:
+        name = os.path.basename(record['file'])
+        if record['error']:
+            print(f"Could not read {name}: {record['error']}")
+            continue
+        if record['dropped_rows']:
+            print(f"File {name} had {record['dropped_rows']} rows with invalid numeric data. These rows were dropped.")
+        if record['skipped']:
+            print(f"Skipping {name}: {record['skipped']}")
+    parsed = sum(not r['cached'] and not r['error'] for r in records)
+    cached = sum(r['cached'] for r in records)
+    dropped = sum(r['dropped_rows'] for r in records)
+    skipped = sum(bool(r['skipped']) for r in records)
+    errors = sum(bool(r['error']) for r in records)
+    print(f"Ingested {len(records)} files: {parsed} parsed, {cached} from cache, "
+          f"{dropped} rows dropped, {skipped} skipped, {errors} unreadable")
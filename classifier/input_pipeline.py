@@ -0,0 +1,79 @@
+# classifier/input_pipeline.py
+"""
+tf.data input pipeline over a WindowDataset.
+
+Only window indices live in the pipeline: each batch is gathered from the
+recordings when it is needed, gets fresh Gaussian jitter, and is prepared on
+tf.data's background threads while the previous batch trains. Training memory
+stays proportional to the recordings, not to the number of windows.
+
+    train_ds, val_ds = split_datasets(windows, y)
+    model.fit(train_ds, validation_data=val_ds, epochs=25)
+"""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+from sklearn.model_selection import train_test_split
+
+from classifier.train_metrics import profile_phase
+
+BATCH_SIZE = 32
+NOISE_STD = 0.003
+
+
+def make_dataset(windows, labels, indices=None, batch_size=BATCH_SIZE, noise_std=0.0,
+                 shuffle=False, jitter=False, seed=None, profiler=None):
+    """
+    Batches of (windows (b, length, features) float32, labels) for the given window indices.
+    noise_std: stddev of the Gaussian noise added to every batch (new noise each epoch).
+    shuffle:   reshuffle the indices every epoch.
+    jitter:    move every window randomly within the dataset's stride every epoch.
+    profiler:  optional classifier.train_metrics.TrainingProfiler credited with the batch production time.
+    """
+    indices = np.arange(len(windows)) if indices is None else np.asarray(indices)
+    labels = tf.constant(np.asarray(labels, dtype=np.float32))
+    window_shape = (windows.length, windows.frames.shape[1])
+
+    def load(batch_indices, batch_seed):
+        t0 = time.perf_counter()
+        rng = np.random.default_rng(batch_seed) if jitter else None
+        batch = windows.gather(starts=windows.epoch_starts(rng, batch_indices))
+        if profiler is not None:
+            profiler.record_input(time.perf_counter() - t0, len(batch))
+        return batch
+
+    def to_batch(batch_indices):
+        batch_seed = tf.random.uniform([], maxval=tf.int64.max, dtype=tf.int64)
+        x = tf.numpy_function(load, [batch_indices, batch_seed], tf.float32)
+        x = tf.ensure_shape(x, (None,) + window_shape)
+        if noise_std:
+            x = x + tf.random.normal(tf.shape(x), stddev=noise_std)
+        return x, tf.gather(labels, batch_indices)
+
+    ds = tf.data.Dataset.from_tensor_slices(indices)
+    if shuffle:
+        ds = ds.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size).map(to_batch, num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def split_indices(windows, y, test_size=0.2, random_state=None):
+    """Stratified train/validation window indices, shared by every trainer so models compare on one split."""
+    return train_test_split(np.arange(len(windows)), stratify=y, test_size=test_size, random_state=random_state)
+
+
+def split_datasets(windows, y, test_size=0.2, batch_size=BATCH_SIZE, noise_std=NOISE_STD, random_state=None,
+                   profiler=None):
+    """
+    Stratified train/validation split; only the training side is shuffled, jittered and noised.
+    With a profiler the split is timed as a phase; augmentation runs lazily while batches are
+    produced, so it shows up in each epoch's input_s rather than as a phase of its own.
+    """
+    with profile_phase(profiler, 'split'):
+        train_idx, test_idx = split_indices(windows, y, test_size, random_state)
+    train_ds = make_dataset(windows, y, train_idx, batch_size, noise_std=noise_std,
+                            shuffle=True, jitter=True, seed=random_state, profiler=profiler)
+    val_ds = make_dataset(windows, y, test_idx, batch_size)
+    return train_ds, val_ds
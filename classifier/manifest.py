@@ -0,0 +1,218 @@
+# classifier/manifest.py
+"""
+Manifest of the recordings in a dataset: canonical exercise / form / side
+parsed from the (inconsistent) file names, the label recorded in the file,
+frame counts and window counts. Class balance and subset selection only need
+this one JSON file; the loaders then read just the selected recordings.
+The manifest records the size and mtime of every file it was built from;
+load_or_build rebuilds it when recordings were added, removed or changed.
+
+    python -m classifier.manifest data/collected_data_goodbad
+    python -m classifier.manifest data/store/collected_data --by exercise form side
+
+    entries = select(load_or_build('data/collected_data'), exercise='curls', balanced=True)
+    dataset, y, le = load_data('data/collected_data/*.csv', files=[e['file'] for e in entries])
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+from collections import defaultdict
+
+from classifier.dataset_store import is_store, open_store, find_recordings, RECORDING_EXTENSIONS, INDEX_FILE
+from core.landmark_window import SEQUENCE_LENGTH
+
+MANIFEST_FILE = 'manifest.json'
+
+EXERCISE_ALIASES = {
+    'curl': 'curls', 'curls': 'curls',
+    'pushup': 'pushups', 'pushups': 'pushups',
+    'situp': 'situps', 'situps': 'situps',
+    'squat': 'squats', 'squats': 'squats', 'airsquat': 'squats', 'airaquat': 'squats',
+}
+SIDES = ('left', 'right', 'front', 'back', 'normal')
+
+_GOOD = re.compile(r'^g+o+d+$')
+_BAD = re.compile(r'^b+a+d+$')
+
+
+def normalize_name(filename):
+    """
+    'squats_goood3.csv' -> {'exercise': 'squats', 'form': 'good', 'side': None}
+    'airaquat_left_bad2.csv' -> {'exercise': 'squats', 'form': 'bad', 'side': 'left'}
+    Unrecognized parts are left as None.
+    """
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    tokens = [t for t in re.sub(r'\d+$', '', stem.lower()).split('_') if t]
+    parsed = {'exercise': None, 'form': None, 'side': None}
+    for token in tokens:
+        if token in EXERCISE_ALIASES:
+            parsed['exercise'] = EXERCISE_ALIASES[token]
+        elif _GOOD.match(token):
+            parsed['form'] = 'good'
+        elif _BAD.match(token):
+            parsed['form'] = 'bad'
+        elif token in SIDES:
+            parsed['side'] = token
+    return parsed
+
+
+def window_count(frames, stride=1, length=SEQUENCE_LENGTH):
+    return max(frames - length, -1) // stride + 1
+
+
+def manifest_path(source):
+    """Manifest location for a store directory, a recordings directory or a glob."""
+    directory = source if os.path.isdir(source) else os.path.dirname(source)
+    return os.path.join(directory, MANIFEST_FILE)
+
+
+def _source_files(source):
+    """The files a manifest of source is built from: a store's index, or the recordings themselves."""
+    if is_store(source):
+        return [os.path.join(source, INDEX_FILE)]
+    paths = find_recordings(source) if os.path.isdir(source) else glob.glob(source)
+    return sorted(p for p in paths if p.endswith(RECORDING_EXTENSIONS))
+
+
+def fingerprint(source):
+    """{file name: [size, mtime_ns]} of the files the manifest is built from."""
+    files = {}
+    for path in _source_files(source):
+        st = os.stat(path)
+        files[os.path.basename(path)] = [st.st_size, st.st_mtime_ns]
+    return files
+
+
+def _recordings(source):
+    """(file, recorded label, frame count) for every recording in source."""
+    if is_store(source):
+        return [(e['file'], e['label'], e['frames']) for e in open_store(source).recordings]
+
+    from classifier.ingest import ingest
+    return [(os.path.basename(r['file']), r['label'], len(r['values']))
+            for r in ingest(_source_files(source)) if not r['error']]
+
+
+def build_manifest(source, length=SEQUENCE_LENGTH):
+    files = fingerprint(source)
+    entries = []
+    for file, label, frames in _recordings(source):
+        entry = {'file': file, 'label': label, **normalize_name(file),
+                 'frames': int(frames), 'windows': window_count(frames, 1, length)}
+        if entry['exercise'] and label and not str(label).startswith(entry['exercise']):
+            print(f"Warning: {file} is named as {entry['exercise']} but labeled {label}")
+        entries.append(entry)
+    manifest = {'source': source, 'sequence_length': length, 'files': files, 'recordings': entries}
+    with open(manifest_path(source), 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def load_manifest(source):
+    with open(manifest_path(source)) as f:
+        return json.load(f)
+
+
+def is_stale(manifest, source):
+    return manifest.get('source') != source or manifest.get('files') != fingerprint(source)
+
+
+def load_or_build(source):
+    """The saved manifest of source, rebuilt first if it is missing or out of date."""
+    try:
+        manifest = load_manifest(source)
+    except (OSError, ValueError):
+        return build_manifest(source)
+    if is_stale(manifest, source):
+        print(f"{manifest_path(source)} is out of date, rebuilding")
+        return build_manifest(source)
+    return manifest
+
+
+def class_stats(entries, by=('exercise', 'form'), stride=1, length=SEQUENCE_LENGTH):
+    """{class tuple: {'recordings', 'frames', 'windows'}} for the given grouping fields."""
+    stats = defaultdict(lambda: {'recordings': 0, 'frames': 0, 'windows': 0})
+    for entry in entries:
+        key = tuple(entry[field] for field in by)
+        stats[key]['recordings'] += 1
+        stats[key]['frames'] += entry['frames']
+        stats[key]['windows'] += window_count(entry['frames'], stride, length)
+    return dict(sorted(stats.items(), key=lambda item: [str(v) for v in item[0]]))
+
+
+def print_stats(entries, by=('exercise', 'form'), stride=1):
+    stats = class_stats(entries, by, stride)
+    print(f"{' / '.join(by):<28} {'recordings':>10} {'frames':>8} {'windows':>8}")
+    for key, counts in stats.items():
+        name = ' / '.join(str(v) for v in key)
+        print(f"{name:<28} {counts['recordings']:>10} {counts['frames']:>8} {counts['windows']:>8}")
+
+
+def select(manifest, exercise=None, form=None, side=None, balanced=False, by=('exercise', 'form'),
+           stride=1, seed=0):
+    """
+    Manifest entries matching the filters (None matches anything).
+    balanced: randomly drop recordings of the larger classes (grouped by `by`)
+    until every class has about as many windows as the smallest one.
+    """
+    entries = [e for e in manifest['recordings']
+               if (exercise is None or e['exercise'] == exercise)
+               and (form is None or e['form'] == form)
+               and (side is None or e['side'] == side)]
+    length = manifest['sequence_length']
+    entries = [e for e in entries if window_count(e['frames'], stride, length) > 0]
+    if not balanced or not entries:
+        return entries
+
+    groups = defaultdict(list)
+    for entry in entries:
+        groups[tuple(entry[field] for field in by)].append(entry)
+    target = min(sum(window_count(e['frames'], stride, length) for e in group) for group in groups.values())
+    rng = random.Random(seed)
+    selected = []
+    for group in groups.values():
+        group = group[:]
+        rng.shuffle(group)
+        total = 0
+        for entry in group:
+            if total >= target:
+                break
+            selected.append(entry)
+            total += window_count(entry['frames'], stride, length)
+    return sorted(selected, key=lambda e: e['file'])
+
+
+def selected_files(source, exercise=None, form=None, side=None, balanced=False, stride=1):
+    """File names to train on for the given filters, or None when no filter is set (use everything)."""
+    if exercise is None and form is None and side is None and not balanced:
+        return None
+    entries = select(load_or_build(source), exercise, form, side, balanced, stride=stride)
+    print_stats(entries, stride=stride)
+    return [e['file'] for e in entries]
+
+
+def add_selection_arguments(parser):
+    parser.add_argument('--exercise', help="train only on this exercise (curls, pushups, situps, squats)")
+    parser.add_argument('--form', choices=['good', 'bad'], help="train only on good or bad form recordings")
+    parser.add_argument('--side', choices=SIDES, help="train only on recordings filmed from this side")
+    parser.add_argument('--balanced', action='store_true', help="subsample recordings to balance the classes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a dataset manifest and print per-class statistics.")
+    parser.add_argument('source', help="CSV directory, CSV glob or dataset store directory")
+    parser.add_argument('--by', nargs='+', default=['exercise', 'form'], help="fields to group statistics by")
+    parser.add_argument('--stride', type=int, default=1, help="window stride for the window counts")
+    args = parser.parse_args()
+
+    manifest = build_manifest(args.source)
+    print(f"Wrote {manifest_path(args.source)} ({len(manifest['recordings'])} recordings)")
+    print_stats(manifest['recordings'], tuple(args.by), args.stride)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# classifier/sweep.py
+"""
+Hyperparameter sweep for the LSTM classifiers.
+
+Every configuration is trained in its own CPU worker process (with TensorFlow
+and BLAS limited to --threads threads each) and measured for validation
+accuracy, parameter count, single-sample inference latency and training time.
+
+    python -m classifier.sweep --task form --workers 4 --threads 2 --accuracy-floor 0.9
+    python -m classifier.sweep --task workout --data data/store/collected_data --grid grid.json
+
+A grid file is either a list of configurations or a dict of option lists whose
+product is swept, e.g. {"lstm_units": [[64, 32], [32]], "dense_units": [64, 0]}.
+Unset options fall back to core.model_utils.DEFAULT_MODEL_CONFIG / TRAINING_DEFAULTS.
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from classifier.tasks import TASKS
+from core.threads import limit_threads
+
+TRAINING_DEFAULTS = {'epochs': 25, 'batch_size': 32, 'stride': 1, 'patience': 5}
+DEFAULT_GRID = {
+    'lstm_units': [(64, 64, 32), (64, 32), (32, 32), (32,), (16,)],
+    'dense_units': [64, 32, 0],
+}
+LATENCY_RUNS = 200
+
+
+def expand_grid(grid):
+    """List of full configurations from a list of configs or a dict of option lists."""
+    from core.model_utils import DEFAULT_MODEL_CONFIG
+
+    if isinstance(grid, dict):
+        keys = list(grid)
+        configs = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    else:
+        configs = [dict(config) for config in grid]
+
+    full = []
+    for config in configs:
+        config = {**DEFAULT_MODEL_CONFIG, **TRAINING_DEFAULTS, **config}
+        config['lstm_units'] = tuple(config['lstm_units'])
+        if len(config['dropout']) != len(config['lstm_units']):
+            # Same pattern as the shipped model: 0.4 between LSTM layers, 0.5 after the last.
+            config['dropout'] = (0.4,) * (len(config['lstm_units']) - 1) + (0.5,)
+        config['dropout'] = tuple(config['dropout'])
+        full.append(config)
+    return full
+
+
+def config_name(config):
+    lstm = 'x'.join(str(u) for u in config['lstm_units'])
+    return f"lstm{lstm}-dense{config['dense_units']}"
+
+
+def measure_latency(model, runs=LATENCY_RUNS):
+    """Median milliseconds for one (1, 30, 99) sample through a traced tf.function."""
+    import tensorflow as tf
+
+    spec = tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32)
+    fn = tf.function(lambda x: model(x, training=False), input_signature=[spec])
+    x = np.zeros((1,) + tuple(model.input_shape[1:]), dtype=np.float32)
+    fn(x)
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn(x).numpy()
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings) * 1000.0)
+
+
+def run_config(task, data, config, seed=42):
+    """Trains one configuration and returns its results row."""
+    # Imported here, not at module level, so importing this module stays cheap.
+    import tensorflow as tf
+    from keras.callbacks import EarlyStopping
+    from core.model_utils import build_model, DEFAULT_MODEL_CONFIG, SEQUENCE_LENGTH, FEATURE_COUNT
+    from classifier.input_pipeline import split_datasets
+    from classifier.tasks import load_data
+
+    threads = int(os.environ.get('TF_NUM_INTRAOP_THREADS', '0'))
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    tf.keras.utils.set_random_seed(seed)
+
+    # _warm_parse_cache already filled the parse cache; workers only read it so
+    # parallel configurations never write the shared cache files.
+    dataset, y, _ = load_data(task, data, config['stride'], update_cache=False)
+    train_ds, val_ds = split_datasets(dataset, y, batch_size=config['batch_size'], random_state=seed)
+    model = build_model((SEQUENCE_LENGTH, FEATURE_COUNT), y.shape[1],
+                        **{key: config[key] for key in DEFAULT_MODEL_CONFIG})
+
+    early_stop = EarlyStopping(monitor='val_loss', patience=config['patience'], restore_best_weights=True)
+    t0 = time.perf_counter()
+    history = model.fit(train_ds, epochs=config['epochs'], validation_data=val_ds,
+                        callbacks=[early_stop], verbose=0)
+    train_s = time.perf_counter() - t0
+    val_loss, val_accuracy = model.evaluate(val_ds, verbose=0)
+
+    return {
+        'config': config_name(config),
+        **{key: json.dumps(list(v)) if isinstance(v, tuple) else v for key, v in config.items()},
+        'val_accuracy': round(float(val_accuracy), 4),
+        'val_loss': round(float(val_loss), 4),
+        'params': int(model.count_params()),
+        'latency_ms': round(measure_latency(model), 3),
+        'train_s': round(train_s, 1),
+        'epochs_run': len(history.history['loss']),
+    }
+
+
+def _warm_parse_cache(data):
+    # Parse CSV sources once up front so the workers all load from the ingest cache.
+    from classifier.dataset_store import is_store, find_recordings, RECORDING_EXTENSIONS
+    from classifier.ingest import ingest
+
+    if not is_store(data):
+        paths = find_recordings(data) if os.path.isdir(data) else glob.glob(data)
+        ingest([p for p in paths if p.endswith(RECORDING_EXTENSIONS)])
+
+
+def run_sweep(task, data, configs, workers=1, threads=1):
+    workers = max(1, min(workers, len(configs)))
+    _warm_parse_cache(data)
+    rows = []
+    # spawn: each worker initializes its own BLAS and TensorFlow with the inherited thread limits.
+    context = multiprocessing.get_context('spawn')
+    # CPU only, and a fixed slice of the cores per worker so parallel runs do not oversubscribe.
+    with limit_threads(threads, cpu_only=True), ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(run_config, task, data, config): config for config in configs}
+        for future in as_completed(futures):
+            name = config_name(futures[future])
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"{name}: failed ({e})")
+                rows.append({'config': name, 'error': str(e)})
+                continue
+            print(f"{name}: val acc {row['val_accuracy']:.3f} | {row['params']} params | "
+                  f"{row['latency_ms']:.2f} ms | trained in {row['train_s']:.0f} s")
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep for the LSTM classifiers.")
+    parser.add_argument('--task', choices=list(TASKS), default='form')
+    parser.add_argument('--data', help="CSV glob/directory or dataset store (default depends on --task)")
+    parser.add_argument('--grid', help="JSON file with a list of configurations or a dict of option lists")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument('--threads', type=int, default=2, help="TensorFlow / BLAS threads per worker")
+    parser.add_argument('--accuracy-floor', type=float, default=0.0,
+                        help="pick the fastest configuration with at least this validation accuracy")
+    parser.add_argument('--output', help="results CSV (default: classifier/sweeps/<task>_<timestamp>.csv)")
+    args = parser.parse_args()
+
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    else:
+        grid = DEFAULT_GRID
+    configs = expand_grid(grid)
+    data = args.data or TASKS[args.task][2]
+    print(f"Sweeping {len(configs)} configurations for the {args.task} classifier "
+          f"({args.workers} workers x {args.threads} threads)")
+
+    results = run_sweep(args.task, data, configs, args.workers, args.threads)
+    if 'latency_ms' in results:
+        results = results.sort_values('latency_ms', na_position='last')
+
+    output = args.output or os.path.join(
+        'classifier', 'sweeps', f"{args.task}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    results.to_csv(output, index=False)
+
+    columns = [c for c in ('config', 'val_accuracy', 'params', 'latency_ms', 'train_s', 'epochs_run', 'error')
+               if c in results]
+    print()
+    print(results[columns].to_string(index=False))
+    print(f"\nResults written to {output}")
+
+    if 'val_accuracy' in results:
+        eligible = results[results['val_accuracy'] >= args.accuracy_floor]
+        if len(eligible):
+            best = eligible.iloc[0]
+            print(f"Fastest configuration with val accuracy >= {args.accuracy_floor}: "
+                  f"{best['config']} ({best['latency_ms']} ms, {best['val_accuracy']:.3f})")
+        else:
+            print(f"No configuration reached val accuracy {args.accuracy_floor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# classifier/tasks.py
+"""
+The two classification tasks, shared by the sweep, compression and feature
+classifier scripts: where each task's model, label encoder and default
+training data live, and how its data is loaded.
+"""
+
+import joblib
+
+from core.model_paths import MODEL_PATH, LABEL_ENCODER_PATH, FORM_MODEL_PATH, FORM_LABEL_ENCODER_PATH
+
+# task: (model path, label encoder path, default data)
+TASKS = {
+    'workout': (MODEL_PATH, LABEL_ENCODER_PATH, 'data/collected_data/*'),
+    'form': (FORM_MODEL_PATH, FORM_LABEL_ENCODER_PATH, 'data/collected_data_goodbad'),
+}
+
+
+def load_data(task, data=None, stride=1, update_cache=True):
+    """
+    The task's training loader: (WindowDataset, one-hot labels, freshly fitted encoder).
+    update_cache=False only reads the parse cache, for processes sharing it.
+    """
+    if task == 'form':
+        from classifier.form_classifier import load_data
+    else:
+        from core.model_utils import load_data
+    return load_data(data or TASKS[task][2], stride, update_cache=update_cache)
+
+
+def load_task(task, data=None, stride=1):
+    """(WindowDataset, integer labels in the shipped encoder's order, shipped encoder) for a task."""
+    dataset, _, _ = load_data(task, data, stride)
+    label_encoder = joblib.load(TASKS[task][1])
+    return dataset, label_encoder.transform(dataset.window_labels), label_encoder
@@ -1,41 +1,35 @@
-from keras.models import Sequential
-from keras.layers import LSTM, Dense, Dropout, Input
-import numpy as np
-from sklearn.model_selection import train_test_split
-from core.model_utils import load_data
+import argparse
+from core.model_utils import load_data, build_model
+from classifier.input_pipeline import split_datasets
+from classifier.manifest import add_selection_arguments, selected_files
+from classifier.train_metrics import TrainingProfiler
 from keras.callbacks import EarlyStopping
 import joblib
 
-X, y, label_encoder = load_data()
-X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, test_size=0.2)
 
-model = Sequential([
-    LSTM(64, return_sequences=True, input_shape=(30, 99)),
-    Dropout(0.4),
+def main():
+    parser = argparse.ArgumentParser(description="Train the workout type classifier.")
+    parser.add_argument('data', nargs='?', default='data/collected_data/*',
+                        help="glob of CSV / .lmk recordings, or a classifier.dataset_store store directory")
+    parser.add_argument('--stride', type=int, default=1, help="frames between consecutive training windows")
+    add_selection_arguments(parser)
+    args = parser.parse_args()
 
-    LSTM(64, return_sequences=True),
-    Dropout(0.4),
+    profiler = TrainingProfiler('workout')
+    files = selected_files(args.data, args.exercise, args.form, args.side, args.balanced, args.stride)
+    dataset, y, label_encoder = load_data(args.data, args.stride, files, profiler)
+    train_ds, val_ds = split_datasets(dataset, y, test_size=0.2, profiler=profiler)
 
-    LSTM(32),
-    Dropout(0.5),
+    model = build_model(input_shape=(30, 99), num_classes=y.shape[1])
+    print(f"Windows: {dataset.shape}, labels: {y.shape}")
+    print(f"Labels: {label_encoder.classes_}")
 
-    Dense(64, activation='relu'),
-    Dropout(0.4),
+    model.fit(train_ds, epochs=25, validation_data=val_ds, callbacks=[profiler.callback()])
+    profiler.close()
 
-    Dense(y.shape[1], activation='softmax')
-])
+    model.save("classifier/model/workout_classifier.keras")
+    joblib.dump(label_encoder, "classifier/model/label_encoder.pkl")
 
 
-model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
-print(f"X_train shape: {X_train.shape}, dtype: {X_train.dtype}")
-print(f"y_train shape: {y_train.shape}, dtype: {y_train.dtype}")
-print(f"Labels: {label_encoder.classes_}")
-noise = np.random.normal(loc=0.0, scale=0.003, size=X_train.shape)
-X_train_noisy = X_train + noise
-
-
-model.fit(X_train_noisy, y_train, epochs=25, validation_data=(X_test, y_test))
-
-model.save("classifier/model/workout_classifier.keras")
-joblib.dump(label_encoder, "classifier/model/label_encoder.pkl")
-
+if __name__ == "__main__":
+    main()
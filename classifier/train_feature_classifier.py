@@ -0,0 +1,93 @@
+# classifier/train_feature_classifier.py
+"""
+Trains the summary-feature classifiers (core.window_features) for workout type
+and form, as a fast alternative to the 30-step LSTMs.
+
+    python -m classifier.train_feature_classifier
+    python -m classifier.train_feature_classifier --task form --model extra_trees
+
+Models are saved as <lstm model>.features.pkl next to the LSTMs and use the
+same label encoders, so AI_FITNESS_MODEL_VARIANT=features swaps them in at
+runtime. Windows are split with classifier.input_pipeline.split_indices, the
+same split the LSTM trainers use for a given seed.
+"""
+
+import argparse
+
+import joblib
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from core.model_paths import variant_path
+from core.window_features import window_features, FEATURE_NAMES
+from classifier.input_pipeline import split_indices
+from classifier.tasks import TASKS, load_task
+
+MODELS = {
+    'logistic': lambda seed: make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000, C=1.0)),
+    'extra_trees': lambda seed: ExtraTreesClassifier(n_estimators=200, min_samples_leaf=2, n_jobs=-1, random_state=seed),
+    'hist_gb': lambda seed: HistGradientBoostingClassifier(max_iter=200, random_state=seed),
+}
+
+
+def dataset_features(dataset, indices, chunk=2048):
+    """Features of the given windows, gathered a chunk at a time."""
+    out = np.empty((len(indices), len(FEATURE_NAMES)), dtype=np.float32)
+    for start in range(0, len(indices), chunk):
+        out[start:start + chunk] = window_features(dataset.gather(indices[start:start + chunk]))
+    return out
+
+
+def linear_weights(model):
+    """
+    Folds StandardScaler + multinomial LogisticRegression into one (W, b) so
+    inference is a single matrix product; None for other estimators.
+    """
+    steps = getattr(model, 'named_steps', {})
+    scaler, clf = steps.get('standardscaler'), steps.get('logisticregression')
+    if scaler is None or clf is None or clf.coef_.shape[0] == 1:
+        return None, None
+    weights = (clf.coef_ / scaler.scale_).T
+    bias = clf.intercept_ - (scaler.mean_ / scaler.scale_) @ clf.coef_.T
+    return weights.astype(np.float32), bias.astype(np.float32)
+
+
+def train(task, kind='logistic', data=None, stride=1, seed=42):
+    dataset, labels, label_encoder = load_task(task, data, stride)
+    train_idx, test_idx = split_indices(dataset, labels, random_state=seed)
+    X_train, X_test = dataset_features(dataset, train_idx), dataset_features(dataset, test_idx)
+
+    model = MODELS[kind](seed)
+    model.fit(X_train, labels[train_idx])
+    accuracy = float((model.predict(X_test) == labels[test_idx]).mean())
+    print(f"{task} [{kind}]: {len(FEATURE_NAMES)} features, test accuracy {accuracy:.3f}")
+
+    if len(model.classes_) != len(label_encoder.classes_):
+        print(f"Warning: {task} training data only covers {len(model.classes_)} of "
+              f"{len(label_encoder.classes_)} classes; probabilities will not line up with the encoder")
+    weights, bias = linear_weights(model)
+    path = variant_path(TASKS[task][0], 'features')
+    joblib.dump({'model': model, 'classes': list(label_encoder.classes_), 'feature_names': FEATURE_NAMES,
+                 'weights': weights, 'bias': bias, 'accuracy': accuracy}, path)
+    print(f"Saved {path}")
+    return accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the summary-feature workout and form classifiers.")
+    parser.add_argument('--task', choices=list(TASKS) + ['both'], default='both')
+    parser.add_argument('--model', choices=list(MODELS), default='logistic')
+    parser.add_argument('--data', help="CSV glob/directory or dataset store (only with a single --task)")
+    parser.add_argument('--stride', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for task in (TASKS if args.task == 'both' else [args.task]):
+        train(task, args.model, args.data, args.stride, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# classifier/train_metrics.py
+"""
+Structured timing for training runs.
+
+TrainingProfiler writes one JSON object per line to classifier/logs/<task>_<timestamp>.jsonl:
+    {"event": "phase", "name": "load", "seconds": ..., "rss_mb": ...}        load, window, split
+    {"event": "epoch", "epoch": 1, "seconds": ..., "samples_per_s": ...,
+     "input_s": ..., "compute_s": ..., "loss": ..., ...}
+    {"event": "summary", "phases": {...}, "peak_rss_mb": ..., ...}
+
+input_s is the time spent producing the epoch's batches (window gather and
+jitter on tf.data's threads); compute_s is the time inside the training steps.
+With prefetching the two overlap, so input_s close to or above compute_s means
+training is waiting on input. Noise is added inside the tf.data graph and
+counts towards compute_s.
+
+Compare two runs:
+    python -m classifier.train_metrics classifier/logs/form_a.jsonl classifier/logs/form_b.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LOG_DIR = os.path.join('classifier', 'logs')
+
+
+def peak_rss_mb(children=False):
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    scale = 1.0 / (1024 * 1024) if sys.platform == 'darwin' else 1.0 / 1024
+    return round(usage.ru_maxrss * scale, 1)
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class TrainingProfiler:
+    def __init__(self, task, log_path=None):
+        self.task = task
+        self.log_path = log_path or os.path.join(LOG_DIR, f"{task}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl")
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        self._file = open(self.log_path, 'w')
+        self._lock = threading.Lock()
+        self._input_s = 0.0
+        self._input_samples = 0
+        self._started = time.perf_counter()
+        self.phases = {}
+        self.epochs = []
+        self.log({'event': 'start', 'task': task, 'argv': sys.argv, 'pid': os.getpid()})
+
+    def log(self, event):
+        event = {'time': round(time.time(), 3), **event}
+        with self._lock:
+            self._file.write(json.dumps(event) + '\n')
+            self._file.flush()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            self.log({'event': 'phase', 'name': name, 'seconds': round(seconds, 4), 'rss_mb': current_rss_mb()})
+
+    def record_input(self, seconds, samples):
+        """Called from the input pipeline's threads with the time spent producing one batch."""
+        with self._lock:
+            self._input_s += seconds
+            self._input_samples += samples
+
+    def take_input(self):
+        """(seconds, samples) produced by the input pipeline since the last call."""
+        with self._lock:
+            taken = (self._input_s, self._input_samples)
+            self._input_s, self._input_samples = 0.0, 0
+        return taken
+
+    def callback(self):
+        """Keras callback logging one 'epoch' event per epoch."""
+        from keras.callbacks import Callback
+
+        profiler = self
+
+        class EpochTimer(Callback):
+            def on_epoch_begin(self, epoch, logs=None):
+                profiler.take_input()
+                self._epoch_start = time.perf_counter()
+                self._compute = 0.0
+
+            def on_train_batch_begin(self, batch, logs=None):
+                self._batch_start = time.perf_counter()
+
+            def on_train_batch_end(self, batch, logs=None):
+                self._compute += time.perf_counter() - self._batch_start
+
+            def on_epoch_end(self, epoch, logs=None):
+                seconds = time.perf_counter() - self._epoch_start
+                input_s, samples = profiler.take_input()
+                event = {
+                    'event': 'epoch',
+                    'epoch': epoch + 1,
+                    'seconds': round(seconds, 3),
+                    'samples': samples,
+                    'samples_per_s': round(samples / self._compute, 1) if self._compute else None,
+                    'input_s': round(input_s, 3),
+                    'compute_s': round(self._compute, 3),
+                    'rss_mb': current_rss_mb(),
+                    **{key: round(float(value), 5) for key, value in (logs or {}).items()},
+                }
+                profiler.epochs.append(event)
+                profiler.log(event)
+
+        return EpochTimer()
+
+    def close(self):
+        if self._file is None:
+            return
+        summary = {
+            'event': 'summary',
+            'total_s': round(time.perf_counter() - self._started, 3),
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'epochs': len(self.epochs),
+            'mean_samples_per_s': _mean(e['samples_per_s'] for e in self.epochs),
+            'mean_input_s': _mean(e['input_s'] for e in self.epochs),
+            'mean_compute_s': _mean(e['compute_s'] for e in self.epochs),
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_children_mb': peak_rss_mb(children=True),
+        }
+        self.log(summary)
+        self._file.close()
+        self._file = None
+        print_summary(summary)
+        print(f"Training log written to {self.log_path}")
+
+
+def profile_phase(profiler, name):
+    """profiler.phase(name), or a no-op when no profiler is given."""
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 3) if values else None
+
+
+def print_summary(summary):
+    phases = ' | '.join(f"{name} {seconds:.2f} s" for name, seconds in summary['phases'].items())
+    print(f"\nPhases: {phases}")
+    print(f"Epochs: {summary['epochs']} | {summary['mean_samples_per_s']} samples/s | "
+          f"input {summary['mean_input_s']} s vs compute {summary['mean_compute_s']} s per epoch | "
+          f"peak RSS {summary['peak_rss_mb']} MB")
+
+
+def read_summary(path):
+    with open(path) as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    return next((e for e in reversed(events) if e['event'] == 'summary'), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the summaries of two training logs.")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    args = parser.parse_args()
+
+    old, new = read_summary(args.baseline), read_summary(args.candidate)
+    if old is None or new is None:
+        raise SystemExit("Both logs need a summary line (did the run finish?)")
+    rows = [(f"phase {name}", old['phases'].get(name), new['phases'].get(name))
+            for name in dict.fromkeys(list(old['phases']) + list(new['phases']))]
+    rows += [(key, old.get(key), new.get(key)) for key in
+             ('total_s', 'mean_samples_per_s', 'mean_input_s', 'mean_compute_s', 'peak_rss_mb')]
+    for name, a, b in rows:
+        change = f"{(b - a) / a * 100.0:+.1f}%" if a and b is not None else ''
+        print(f"{name:<22} {str(a):>10} -> {str(b):>10} {change}")
+
+
+if __name__ == "__main__":
+    main()
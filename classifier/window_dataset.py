@@ -0,0 +1,121 @@
+# classifier/window_dataset.py
+"""
+Fixed-length training windows over landmark recordings without copying them.
+
+A window is identified by the absolute row its first frame starts at in one
+(N, 99) frames array (a dataset_store memmap, or the recordings concatenated
+once). Memory is proportional to the number of frames; windows are only
+materialized per batch by gather().
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.landmark_window import SEQUENCE_LENGTH
+
+
+def sliding_windows(frames, length=SEQUENCE_LENGTH, stride=1):
+    """Read-only (n_windows, length, features) view of frames; no data is copied."""
+    frames = np.asarray(frames)
+    if len(frames) < length:
+        return np.empty((0, length, frames.shape[1]), dtype=frames.dtype)
+    # sliding_window_view puts the window axis last: (n, features, length).
+    return sliding_window_view(frames, length, axis=0).transpose(0, 2, 1)[::stride]
+
+
+class WindowDataset:
+    """
+    Every `stride`-th window of `length` frames inside each recording.
+
+        dataset = WindowDataset.from_store(open_store('data/store/collected_data'), stride=2)
+        batch = dataset.gather(indices)          # (len(indices), 30, 99) float32
+        starts = dataset.epoch_starts(rng)       # random window offsets for one epoch
+
+    starts/recording_ids/labels are per-window index arrays; label strings are
+    in recording_labels and windows never cross a recording boundary.
+    """
+
+    def __init__(self, frames, offsets, lengths, labels, length=SEQUENCE_LENGTH, stride=1):
+        if stride < 1:
+            raise ValueError("stride must be at least 1")
+        self.frames = frames
+        self.length = length
+        self.stride = stride
+        self.recording_offsets = np.asarray(offsets, dtype=np.int64)
+        self.recording_lengths = np.asarray(lengths, dtype=np.int64)
+        self.recording_labels = list(labels)
+
+        counts = np.maximum(self.recording_lengths - length, -1) // stride + 1
+        self.window_counts = counts
+        self.recording_ids = np.repeat(np.arange(len(counts)), counts)
+        first = np.cumsum(counts) - counts
+        local = (np.arange(counts.sum()) - np.repeat(first, counts)) * stride
+        self.starts = self.recording_offsets[self.recording_ids] + local
+        self._steps = np.arange(length)
+
+    @classmethod
+    def from_store(cls, store, length=SEQUENCE_LENGTH, stride=1, recordings=None):
+        """Windows over a dataset_store.LandmarkStore (optionally only the given recording indices)."""
+        entries = store.recordings if recordings is None else [store.recordings[i] for i in recordings]
+        return cls(store.frames,
+                   [e['offset'] for e in entries],
+                   [e['frames'] for e in entries],
+                   [e['label'] for e in entries],
+                   length, stride)
+
+    @classmethod
+    def from_recordings(cls, recordings, length=SEQUENCE_LENGTH, stride=1):
+        """Windows over [(frames, label)]; the frames are concatenated once into a float32 array."""
+        lengths = [len(frames) for frames, _ in recordings]
+        if recordings:
+            frames = np.concatenate([np.asarray(f, dtype=np.float32) for f, _ in recordings])
+        else:
+            frames = np.zeros((0, 0), dtype=np.float32)
+        offsets = np.cumsum(lengths) - lengths
+        return cls(frames, offsets, lengths, [label for _, label in recordings], length, stride)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def shape(self):
+        return (len(self.starts), self.length, self.frames.shape[1])
+
+    @property
+    def window_labels(self):
+        """Label string of every window."""
+        return np.asarray(self.recording_labels, dtype=object)[self.recording_ids]
+
+    def recording_windows(self, i):
+        """Zero-copy (n_windows, length, features) view of recording i at this dataset's stride."""
+        start = self.recording_offsets[i]
+        return sliding_windows(self.frames[start:start + self.recording_lengths[i]], self.length, self.stride)
+
+    def epoch_starts(self, rng=None, indices=None):
+        """
+        One epoch of window offsets with each start moved randomly within its
+        stride, so successive epochs see different windows from the same
+        recordings. Without rng (or with stride 1) the fixed starts are returned.
+        indices restricts the result to those windows.
+        """
+        if indices is None:
+            indices = slice(None)
+        starts = self.starts[indices]
+        if rng is None or self.stride == 1:
+            return starts
+        ends = (self.recording_offsets + self.recording_lengths - self.length)[self.recording_ids[indices]]
+        jitter = rng.integers(0, self.stride, size=len(starts))
+        return np.minimum(starts + jitter, ends)
+
+    def gather(self, indices=None, starts=None, out=None):
+        """
+        Copies the windows at `indices` (positions in this dataset) or at explicit
+        `starts` into a (n, length, features) float32 array.
+        """
+        if starts is None:
+            starts = self.starts if indices is None else self.starts[indices]
+        rows = starts[:, None] + self._steps
+        if out is None:
+            out = np.empty((len(starts), self.length, self.frames.shape[1]), dtype=np.float32)
+        np.take(self.frames, rows, axis=0, out=out)
+        return out
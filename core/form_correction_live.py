@@ -3,7 +3,8 @@ import cv2
 import numpy as np
 import mediapipe as mp
 import joblib
-from core.model_utils import extract_pose_row
+from core.landmarks import landmarks_into
+from core.roi import PoseROI
 
 model = joblib.load("classifier/model/form_classifier.pkl")
 label_encoder = joblib.load("classifier/model/form_label_encoder.pkl")
@@ -12,8 +13,7 @@ mp_pose = mp.solutions.pose
 pose = mp_pose.Pose()
 
 def get_form_label(pose_landmarks):
-    row = extract_pose_row(pose_landmarks)
-    X = np.array([row])  
+    X = landmarks_into(pose_landmarks)[np.newaxis]
     pred = model.predict(X)[0]
     label = label_encoder.inverse_transform([pred])[0]
     return label
@@ -21,14 +21,14 @@ def get_form_label(pose_landmarks):
 def main():
     cap = cv2.VideoCapture(0)
     print("Starting form correction. Press q to quit.")
+    roi = PoseROI()
 
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             break
 
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = pose.process(image_rgb)
+        result = roi.to_frame(pose.process(roi.prepare(frame)))
 
         if result.pose_landmarks:
             label = get_form_label(result.pose_landmarks)
@@ -6,14 +6,16 @@ import mediapipe as mp
 import threading
 import speech_recognition as sr
 from queue import Queue
-from core.predictor import model, label_encoder
+from core.predictor import load_classifier, FORM_MODEL_PATH, FORM_LABEL_ENCODER_PATH
 from core.mood_check import speak
-from keras.models import load_model
 import joblib
 from firebase_admin import firestore
 from datetime import datetime
 
-from utils.data_logger import save_workout_data
+from utils.session_journal import record_session
+from core.pipeline import WorkoutPipeline
+from core.roi import PoseROI
+from core.trackers import FreeForAllTracker
 
 mp_pose = mp.solutions.pose
 pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
@@ -68,22 +70,9 @@ def start_break_timer(seconds, frame_shape):
             break
     cv2.destroyWindow("Break Timer")
 
-def extract_landmarks(results):
-    if not results.pose_landmarks:
-        return None
-    return np.array([coord for lm in results.pose_landmarks.landmark for coord in (lm.x, lm.y, lm.z)], dtype=np.float32)
-
-def calculate_angle(a, b, c):
-    a = np.array(a)
-    b = np.array(b)
-    c = np.array(c)
-    radians = np.arctan2(c[1]-b[1], c[0]-b[0]) - np.arctan2(a[1]-b[1], a[0]-b[0])
-    angle = np.abs(radians * 180.0 / np.pi)
-    return 360 - angle if angle > 180 else angle
-
 def main(user_id=None):
-    form_model = load_model('classifier/model/form_classifier_model.keras')
-    form_label_encoder = joblib.load('classifier/model/form_label_encoder.pkl')
+    form_model = load_classifier(FORM_MODEL_PATH)
+    form_label_encoder = joblib.load(FORM_LABEL_ENCODER_PATH)
 
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
@@ -91,173 +80,46 @@ def main(user_id=None):
         return
     start_time = time.time()
 
-    seq_length = 30
-    landmark_seq = []
-
-    current_workout = None
-    last_change_time = time.time()
-    stable_duration_required = 5.0
-
-    rep_counts = {
-    'curls': 0, 
-    'pushups': 0, 
-    'situps': 0,
-    'squats': 0,
-    'pushups_good': 0,
-    'pushups_bad': 0,
-    'curls_good': 0,
-    'curls_bad': 0,
-    'situps_good': 0,
-    'situps_bad': 0,
-    'squats_good': 0,
-    'squats_bad': 0}
-    calories = 0.0
-    stages = {'curls': None, 'pushups': None, 'situps': None, 'squats': None}
+    tracker = FreeForAllTracker(form_model, form_label_encoder, announce=speak)
+    pipeline = WorkoutPipeline(cap, pose, tracker, 'Free-for-all Workout Detection', wait_ms=1, roi=PoseROI())
 
     break_queue = Queue()
     done_queue = Queue()
     threading.Thread(target=voice_listener, args=(break_queue, done_queue), daemon=True).start()
 
-    speak("Starting free-for-all workout detection. Begin exercising!")
-
-    try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            if not done_queue.empty():
-                print("👋 User is done. Exiting workout.")
-                break
-
-            while not break_queue.empty():
-                break_queue.get()
+    def handle_voice_commands(pipeline):
+        if not done_queue.empty():
+            print("👋 User is done. Exiting workout.")
+            return False
+
+        while not break_queue.empty():
+            break_queue.get()
+            if pipeline.last_frame_shape is None:
+                continue
+            # Nothing is counted while the user answers and rests.
+            with pipeline.paused():
                 seconds = ask_for_break_duration()
                 print(f"⏸️ Taking a {seconds}-second break...")
-                start_break_timer(seconds, frame.shape)
-                print("Break over. Resuming workout.")
-
-            img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = pose.process(img_rgb)
-            landmarks = extract_landmarks(results)
-
-            if landmarks is not None and results.pose_landmarks:
-                lm = results.pose_landmarks.landmark
-                landmark_seq.append(landmarks)
-                if len(landmark_seq) > seq_length:
-                    landmark_seq.pop(0)
-
-                if len(landmark_seq) == seq_length:
-                    input_data = np.expand_dims(np.array(landmark_seq), axis=0)
-                    pred_label = label_encoder.inverse_transform([np.argmax(model.predict(input_data, verbose=0))])[0]
-                    form_probs = form_model.predict(input_data, verbose=0)
-                    form_pred_label = form_label_encoder.inverse_transform(np.argmax(form_probs, axis=1))[0]
-
-
-                    if pred_label == "pushups":
-                        shoulder = [lm[11].x, lm[11].y]
-                        hip = [lm[23].x, lm[23].y]
-                        ankle = [lm[27].x, lm[27].y]
-                        back_angle = calculate_angle(shoulder, hip, ankle)
-
-                        elbow_angle = calculate_angle([lm[11].x, lm[11].y],
-                                   [lm[13].x, lm[13].y],
-                                   [lm[15].x, lm[15].y])
-                        shoulder_y = lm[11].y
-                        form_pred_label = "pushupsgood" if 175 <= back_angle <= 183 and elbow_angle > 165 and shoulder_y < 0.35 else "pushupsbad"
-
-                        if elbow_angle < 90 and shoulder_y > 0.6:
-                            stages['pushups'] = "down"
-                        if elbow_angle > 150 and shoulder_y < 0.4 and stages['pushups'] == "down":
-                            stages['pushups'] = "up"
-                            rep_counts['pushups_good' if form_pred_label == "pushupsgood" else 'pushups_bad'] += 1
-                            rep_counts['pushups'] += 1
-                            calories += 0.5
-                            print(f"Push-up #{rep_counts['pushups']} | {calories:.1f} cal")
-
-                    elif pred_label == "curls":
-                        shoulder = [lm[11].x, lm[11].y]
-                        elbow = [lm[13].x, lm[13].y]
-                        wrist = [lm[15].x, lm[15].y]
-                        angle = calculate_angle(shoulder, elbow, wrist)
-
-                        form_pred_label = "curlsgood" if angle < 25 or angle > 170 else "curlsbad"
-                        if angle > 160:
-                            stages['curls'] = "down"
-                        if angle < 30 and stages['curls'] == "down":
-                            stages['curls'] = "up"
-                            rep_counts['curls_good' if form_pred_label == "curlsgood" else 'curls_bad'] += 1
-                            rep_counts['curls'] += 1
-                            calories += 0.5
-                            print(f"Curl #{rep_counts['curls']} |{calories:.1f} cal")
-
-
-                    elif pred_label == "situps":
-                        shoulder = [lm[11].x, lm[11].y]
-                        hip = [lm[23].x, lm[23].y]
-                        knee = [lm[25].x, lm[25].y]
-                        angle = calculate_angle(shoulder, hip, knee)
+                start_break_timer(seconds, pipeline.last_frame_shape)
+            print("Break over. Resuming workout.")
+        return True
 
-                        form_pred_label = "situpsgood" if angle < 50 else "situpsbad"
-                        if angle > 120:
-                            stages['situps'] = "down"
-                        if angle < 75 and stages['situps'] == "down":
-                            stages['situps'] = "up"
-                            rep_counts['situps_good' if form_pred_label == "situpsgood" else 'situps_bad'] += 1
-                            rep_counts['situps'] += 1
-                            calories += 0.6
-                            print(f"Sit-up #{rep_counts['situps']} | {calories:.1f} cal")
-
-                    elif pred_label == "squats":
-                        hip = [lm[23].x, lm[23].y]
-                        knee = [lm[25].x, lm[25].y]
-                        ankle = [lm[27].x, lm[27].y]
-                        angle = calculate_angle(hip, knee, ankle)
-
-                        form_pred_label = "squatsgood" if angle < 70 else "squatsbad"
-
-                        if angle > 150:
-                            stages['squats'] = "up"
-                        if angle < 90 and stages['squats'] == "up":
-                            stages['squats'] = "down"
-                            rep_counts['squats_good' if form_pred_label == "squatsgood" else 'squats_bad'] += 1
-                            rep_counts['squats'] += 1
-                            calories += 0.7
-                            print(f"Squat #{rep_counts['squats']} | {calories:.1f} cal")
-
-
-                    if pred_label != current_workout:
-                        current_workout = pred_label
-                        last_change_time = time.time()
-                        if current_workout in stages:
-                            stages[current_workout] = None
-
-                    border_color = (0, 255, 0) if form_pred_label.endswith("good") else (0, 0, 255)
-                    cv2.rectangle(frame, (0, 0), (frame.shape[1], frame.shape[0]), border_color, 10)
-
-                    current_time = time.time()
-                    if current_time - last_change_time >= stable_duration_required:
-                        speak(f"Now you're doing {current_workout}")
-                        last_change_time = current_time + 10000
-
-            y = 30
-            for workout, count in rep_counts.items():
-                cv2.putText(frame, f"{workout}: {count}", (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                y += 30
-            cv2.putText(frame, f"Calories: {calories:.1f}", (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    speak("Starting free-for-all workout detection. Begin exercising!")
 
-            cv2.imshow('Free-for-all Workout Detection', frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+    try:
+        pipeline.run(on_tick=handle_voice_commands)
 
     finally:
+        pipeline.timer.report()
+        tracker.scheduler.report()
+        rep_counts = tracker.rep_counts
+        calories = tracker.calories
+
         print("\nWorkout Summary:")
         for workout, count in rep_counts.items():
             print(f"  {workout.capitalize()}: {count} reps")
         print(f"  Total Calories burned: {calories:.1f} cal")
 
-        if user_id:
-            print(f"🔐 User ID: {user_id} (ready to save data if needed)")
-
         """ db = firestore.client()
         doc_ref = db.collection('workout_data').document(f"{user_id}_{datetime.today().date()}")
 
@@ -268,17 +130,24 @@ def main(user_id=None):
             }) """
         
 
-        duration = round(time.time() - start_time) // 60 
-        save_workout_data(
-            user_id=user_id,
-            reps_dict=rep_counts,
-            calories=calories,
-            duration=duration,
-            plank_time=0 
-)
-
         cap.release()
         cv2.destroyAllWindows()
+
+        duration = round(time.time() - start_time) // 60 
+        if user_id:
+            try:
+                record_session(
+                    user_id=user_id,
+                    reps_dict=rep_counts,
+                    calories=calories,
+                    duration=duration,
+                    plank_time=0
+                )
+                print(f"Workout saved for user {user_id}; syncing to Firestore in the background")
+            except Exception as e:
+                print(f"Error saving workout data: {e}")
+        else:
+            print("No user_id provided — workout data not saved.")
         return "done" 
 
 
@@ -0,0 +1,79 @@
+# core/landmark_window.py
+
+import numpy as np
+
+from core.landmarks import FEATURE_COUNT
+
+# Frames per classifier window; every trainer, the dataset store and the runtime use this one.
+SEQUENCE_LENGTH = 30
+
+
+class LandmarkWindow:
+    """
+    Preallocated ring buffer holding the last seq_length landmark frames.
+
+    Every frame is written twice, at slot i and slot i + seq_length, so the
+    current window is always the contiguous slice buffer[pos:pos + seq_length].
+    That slice is a view: window()/batch() never allocate or copy and can be
+    handed straight to the classifiers.
+    Until the buffer is full the window is zero-padded at the start, which
+    matches predictor.preprocess_landmarks.
+    """
+
+    def __init__(self, seq_length=SEQUENCE_LENGTH, num_features=FEATURE_COUNT, dtype=np.float32):
+        self.seq_length = seq_length
+        self.num_features = num_features
+        self._buffer = np.zeros((2 * seq_length, num_features), dtype=dtype)
+        self._pos = 0
+        self.count = 0
+
+    @property
+    def full(self):
+        return self.count == self.seq_length
+
+    def __len__(self):
+        return self.count
+
+    def push(self, row):
+        """Appends one frame of num_features values, evicting the oldest when full."""
+        self._buffer[self._pos] = row
+        self._buffer[self._pos + self.seq_length] = row
+        self._advance()
+
+    def next_row(self):
+        """
+        View of the slot the next frame goes into, for writers that fill the
+        buffer in place (e.g. core.landmarks.landmarks_into). Call commit() after.
+        """
+        return self._buffer[self._pos]
+
+    def commit(self):
+        """Publishes the row written through next_row()."""
+        self._buffer[self._pos + self.seq_length] = self._buffer[self._pos]
+        self._advance()
+
+    def extend(self, rows):
+        for row in rows:
+            self.push(row)
+
+    def _advance(self):
+        self._pos = (self._pos + 1) % self.seq_length
+        if self.count < self.seq_length:
+            self.count += 1
+
+    def window(self):
+        """(seq_length, num_features) view, oldest frame first."""
+        return self._buffer[self._pos:self._pos + self.seq_length]
+
+    def batch(self):
+        """(1, seq_length, num_features) view ready to pass to the models."""
+        return self.window()[np.newaxis]
+
+    def latest(self):
+        """View of the most recently pushed frame."""
+        return self._buffer[self._pos + self.seq_length - 1]
+
+    def reset(self):
+        self._buffer.fill(0)
+        self._pos = 0
+        self.count = 0
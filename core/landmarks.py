@@ -0,0 +1,25 @@
+# core/landmarks.py
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+FEATURE_COUNT = NUM_LANDMARKS * 3
+
+
+def landmarks_into(pose_landmarks, out=None, visibility_out=None):
+    """
+    Writes MediaPipe pose landmarks as [x0,y0,z0, x1,y1,z1, ...] into out.
+
+    out: caller-provided float32 buffer of 99 values (e.g. LandmarkWindow.next_row()),
+         allocated if None.
+    visibility_out: optional buffer of 33 values that receives each landmark's visibility.
+    Returns out.
+    """
+    if out is None:
+        out = np.empty(FEATURE_COUNT, dtype=np.float32)
+    rows = out.reshape(NUM_LANDMARKS, 3)  # a view: rows are written straight into out
+    for i, lm in enumerate(pose_landmarks.landmark):
+        rows[i] = (lm.x, lm.y, lm.z)
+        if visibility_out is not None:
+            visibility_out[i] = lm.visibility
+    return out
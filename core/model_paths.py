@@ -0,0 +1,20 @@
+# core/model_paths.py
+"""
+Where the trained classifiers and their variants live. Kept apart from
+core.predictor, which loads and verifies the workout model when imported,
+so training and benchmark scripts can use the paths without that cost.
+"""
+
+import os
+
+MODEL_PATH = "classifier/model/workout_classifier.keras"
+LABEL_ENCODER_PATH = "classifier/model/label_encoder.pkl"
+FORM_MODEL_PATH = "classifier/model/form_classifier_model.keras"
+FORM_LABEL_ENCODER_PATH = "classifier/model/form_label_encoder.pkl"
+
+
+def variant_path(model_path, variant):
+    """File classifier.compress writes a variant to, e.g. workout_classifier.int8.tflite."""
+    stem = os.path.splitext(model_path)[0]
+    extension = {"student": "keras", "features": "pkl"}.get(variant, "tflite")
+    return f"{stem}.{variant}.{extension}"
@@ -1,59 +1,96 @@
-import pandas as pd
-import numpy as np
 import glob
+import inspect
+import os
 from sklearn.preprocessing import LabelEncoder
 from keras.utils import to_categorical
 
-SEQUENCE_LENGTH = 30
+from classifier.dataset_store import is_store, open_store, RECORDING_EXTENSIONS
+from classifier.window_dataset import WindowDataset
+from classifier.ingest import ingest, print_report
+from classifier.train_metrics import profile_phase
+from core.landmark_window import SEQUENCE_LENGTH, FEATURE_COUNT
 
-def load_data(path='classifier/collected_data/*.csv'):
-    all_sequences = []
-    all_labels = []
+
+def _store_dataset(path, stride, files=None, profiler=None):
+    with profile_phase(profiler, 'load'):
+        store = open_store(path)
+        keep = []
+        for i, entry in enumerate(store.recordings):
+            if files is not None and entry['file'] not in files:
+                continue
+            if entry['frames'] < SEQUENCE_LENGTH:
+                print(f"Skipping {entry['file']} because it has too few valid frames ({entry['frames']})")
+                continue
+            keep.append(i)
+    with profile_phase(profiler, 'window'):
+        return WindowDataset.from_store(store, SEQUENCE_LENGTH, stride, recordings=keep)
+
+
+def _load_csvs(path, files=None, update_cache=True):
+    paths = [p for p in glob.glob(path)
+             if p.endswith(RECORDING_EXTENSIONS) and (files is None or os.path.basename(p) in files)]
+    records = ingest(paths, min_frames=SEQUENCE_LENGTH, update_cache=update_cache)
+    print_report(records)
+    return [(r['values'], r['label']) for r in records if not r['error'] and not r['skipped']]
+
+
+def load_data(path='data/collected_data/*', stride=1, files=None, profiler=None, update_cache=True):
+    """
+    path is either a glob of CSV / .lmk recordings (e.g. 'data/collected_data/*') or a store directory written by
+    classifier.dataset_store, which is memory-mapped instead of parsed.
+    files optionally limits loading to these file names (see classifier.manifest.select).
+
+    Returns (dataset, y, label_encoder): dataset is a WindowDataset with every
+    `stride`-th 30-frame window of each recording, y the matching one-hot labels.
+    Windows are only copied out by dataset.gather().
+    profiler: optional classifier.train_metrics.TrainingProfiler timing the load and window phases.
+    update_cache=False only reads the parse cache (see classifier.ingest.ingest).
+    """
     label_encoder = LabelEncoder()
 
-    csv_files = glob.glob(path)
-    raw_data = []
-
-    for file in csv_files:
-        try:
-            df = pd.read_csv(file)
-        except Exception as e:
-            print(f"Could not read {file}: {e}")
-            continue
-        
-        pose_cols = [col for col in df.columns if col != 'label']
-        df[pose_cols] = df[pose_cols].apply(pd.to_numeric, errors='coerce')
-
-        bad_rows = df[df[pose_cols].isnull().any(axis=1)]
-        if not bad_rows.empty:
-            print(f"File {file} has {len(bad_rows)} rows with invalid numeric data. These rows will be dropped.")
-            df = df.dropna(subset=pose_cols)
-
-        if len(df) < SEQUENCE_LENGTH:
-            print(f"Skipping {file} because it has too few valid frames ({len(df)})")
-            continue
-
-        label = df['label'].iloc[0]
-        df = df.drop('label', axis=1)
-        raw_data.append((df.values, label))
-
-    for frames, label in raw_data:
-        for i in range(len(frames) - SEQUENCE_LENGTH + 1):
-            seq = frames[i:i + SEQUENCE_LENGTH]
-            all_sequences.append(seq)
-            all_labels.append(label)
-
-    if not all_sequences:
+    if is_store(path):
+        dataset = _store_dataset(path, stride, files, profiler)
+    else:
+        with profile_phase(profiler, 'load'):
+            recordings = _load_csvs(path, files, update_cache)
+        with profile_phase(profiler, 'window'):
+            dataset = WindowDataset.from_recordings(recordings, SEQUENCE_LENGTH, stride)
+
+    if not len(dataset):
         raise ValueError("No valid sequences found. Check your CSV files and cleaning steps.")
 
-    X = np.array(all_sequences, dtype=np.float32)
-    y = label_encoder.fit_transform(all_labels)
+    y = label_encoder.fit_transform(dataset.window_labels)
     y = to_categorical(y)
 
-    return X, y, label_encoder
+    return dataset, y, label_encoder
+
+
+def build_model(input_shape, num_classes, lstm_units=(64, 64, 32), dropout=(0.4, 0.4, 0.5),
+                dense_units=64, dense_dropout=0.4):
+    """
+    Stacked LSTM classifier. dropout has one rate per LSTM layer; dense_units=0
+    drops the hidden Dense layer. The defaults are DEFAULT_MODEL_CONFIG.
+    """
+    from keras.models import Sequential
+    from keras.layers import LSTM, Dense, Dropout
+
+    if len(dropout) != len(lstm_units):
+        raise ValueError("dropout needs one rate per LSTM layer")
+    layers = []
+    for i, (units, rate) in enumerate(zip(lstm_units, dropout)):
+        kwargs = {'input_shape': input_shape} if i == 0 else {}
+        layers.append(LSTM(units, return_sequences=i < len(lstm_units) - 1, **kwargs))
+        layers.append(Dropout(rate))
+    if dense_units:
+        layers.append(Dense(dense_units, activation='relu'))
+        layers.append(Dropout(dense_dropout))
+    layers.append(Dense(num_classes, activation='softmax'))
+
+    model = Sequential(layers)
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    return model
+
 
-def extract_pose_row(pose_landmarks):
-    keypoints = []
-    for lm in pose_landmarks.landmark:
-        keypoints.extend([lm.x, lm.y, lm.z])
-    return np.array(keypoints, dtype=np.float32)
+# The architecture both classifiers have shipped with (build_model's defaults); build_model(**overrides) varies it.
+DEFAULT_MODEL_CONFIG = {name: param.default for name, param in inspect.signature(build_model).parameters.items()
+                        if param.default is not inspect.Parameter.empty}
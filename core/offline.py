@@ -0,0 +1,184 @@
+# core/offline.py
+"""
+Headless rep counting and form classification over recorded workout videos.
+
+    python -m core.offline session.mp4 --mode curl
+    python -m core.offline recordings/ --mode free_for_all --workers 8 --output results.json
+
+Frames are decoded and processed back to back (no imshow/waitKey, no frame
+dropping), so a video runs as fast as pose estimation allows. A directory is
+spread across a process pool, one video per worker process.
+
+Without --output the JSON results are the only thing written to stdout;
+progress, model loading and the trackers' per-rep prints go to stderr, so
+`python -m core.offline recordings/ > results.json` gives valid JSON.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+from core.threads import limit_threads
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.m4v', '.webm')
+
+
+class VideoClock:
+    """Time source for the trackers that follows the video timestamp instead of the wall clock."""
+
+    def __init__(self, fps):
+        self.fps = fps
+        self.frame_index = 0
+
+    def __call__(self):
+        return self.frame_index / self.fps
+
+
+def _single_thread_cv2():
+    import cv2
+    cv2.setNumThreads(1)
+
+
+def process_video(path, mode='free_for_all'):
+    """
+    Runs one video through the workout logic.
+    mode: 'free_for_all' or one of the start_workout types (curl, squat, pushup, situp, plank).
+    Returns a JSON-serializable dict with the summary and one entry per rep.
+    Anything printed on the way (model loading, the trackers' rep messages) goes to stderr.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        return _process_video(path, mode)
+
+
+def _process_video(path, mode):
+    # Imported here so worker processes load TensorFlow / MediaPipe after _single_thread_cv2.
+    import cv2
+    import joblib
+    import mediapipe as mp
+    from core.predictor import load_classifier, FORM_MODEL_PATH, FORM_LABEL_ENCODER_PATH
+    from core.trackers import WorkoutTracker, FreeForAllTracker, WORKOUT_MAP
+    from core.roi import PoseROI
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return {'video': path, 'mode': mode, 'error': 'could not open video'}
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    clock = VideoClock(fps)
+    form_model = load_classifier(FORM_MODEL_PATH, verify=False)
+    form_label_encoder = joblib.load(FORM_LABEL_ENCODER_PATH)
+
+    if mode == 'free_for_all':
+        tracker = FreeForAllTracker(form_model, form_label_encoder, clock=clock)
+    else:
+        workout_type = WORKOUT_MAP.get(mode.lower())
+        if workout_type is None:
+            cap.release()
+            return {'video': path, 'mode': mode, 'error': f"unknown mode, expected free_for_all or one of {list(WORKOUT_MAP)}"}
+        tracker = WorkoutTracker(workout_type, form_model, form_label_encoder, clock=clock)
+
+    roi = PoseROI()
+    started = time.perf_counter()
+    frames = 0
+    with mp.solutions.pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5) as pose:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            clock.frame_index = frames
+            results = roi.to_frame(pose.process(roi.prepare(frame)))
+            tracker.update(results)
+            frames += 1
+    cap.release()
+    elapsed = time.perf_counter() - started
+
+    duration = frames / fps
+    result = {
+        'video': path,
+        'mode': mode,
+        'frames': frames,
+        'fps': fps,
+        'duration_s': round(duration, 2),
+        'processing_s': round(elapsed, 2),
+        'speedup': round(duration / elapsed, 2) if elapsed else None,
+        'rep_counts': tracker.rep_counts,
+        'calories': round(tracker.calories, 1),
+        'classifier_skip_rate': round(tracker.scheduler.skip_rate, 3),
+        'reps': tracker.rep_log,
+    }
+    if isinstance(tracker, WorkoutTracker) and tracker.workout_type == 'plank':
+        result['plank_time'] = round(tracker.plank_total_time, 1)
+    return result
+
+
+def find_videos(directory):
+    videos = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                videos.append(os.path.join(root, name))
+    return sorted(videos)
+
+
+def process_directory(directory, mode='free_for_all', workers=None):
+    """Processes every video under directory in a process pool (default: one worker per core)."""
+    videos = find_videos(directory)
+    if not videos:
+        print(f"No videos found in {directory}", file=sys.stderr)
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(videos))
+    print(f"Processing {len(videos)} videos with {workers} worker processes...", file=sys.stderr)
+    results = []
+    # spawn: TensorFlow and MediaPipe are not fork-safe once initialized.
+    context = multiprocessing.get_context('spawn')
+    # One video per process: keep each worker's TF / OpenCV / BLAS pools to a
+    # single thread so the pool does not oversubscribe the cores.
+    with limit_threads(1), ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                               initializer=_single_thread_cv2) as pool:
+        futures = {pool.submit(process_video, path, mode): path for path in videos}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'video': path, 'mode': mode, 'error': str(e)}
+            if 'error' in result:
+                print(f"Error processing {path}: {result['error']}", file=sys.stderr)
+            else:
+                print(f"{path}: {len(result['reps'])} reps, {result['speedup']}x real time", file=sys.stderr)
+            results.append(result)
+    results.sort(key=lambda r: r['video'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rep counting over recorded workout videos.")
+    parser.add_argument('path', help="video file or directory of videos")
+    parser.add_argument('--mode', default='free_for_all',
+                        help="free_for_all (default) or curl, squat, pushup, situp, plank")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--output', help="write results as JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.path):
+        results = process_directory(args.path, args.mode, args.workers)
+    else:
+        results = [process_video(args.path, args.mode)]
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Results written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# core/pipeline.py
+
+import contextlib
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class LatestQueue:
+    """
+    Bounded hand-off between two pipeline stages.
+    When the consumer falls behind, the oldest item is dropped so the consumer
+    always works on the most recent frame instead of a growing backlog.
+    """
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the next item, or None on timeout or once the queue is closed and empty."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageTimer:
+    """Keeps the most recent durations per stage so we can see where the frame budget goes."""
+
+    def __init__(self, history=300):
+        self.history = history
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.history)
+            self._samples[stage].append(seconds)
+
+    def summary(self):
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items()}
+        return {
+            stage: {
+                'count': int(len(values)),
+                'mean_ms': float(values.mean() * 1000.0),
+                'p95_ms': float(np.percentile(values, 95) * 1000.0),
+                'max_ms': float(values.max() * 1000.0),
+            }
+            for stage, values in samples.items() if len(values)
+        }
+
+    def report(self):
+        print("\nPipeline stage timings (last {} frames):".format(self.history))
+        for stage, stats in self.summary().items():
+            print(f"  {stage:<10} mean {stats['mean_ms']:6.1f} ms | p95 {stats['p95_ms']:6.1f} ms | max {stats['max_ms']:6.1f} ms")
+
+
+class FramePacket:
+    __slots__ = ('index', 'frame', 'captured_at', 'results', 'overlay')
+
+    def __init__(self, index, frame, captured_at):
+        self.index = index
+        self.frame = frame
+        self.captured_at = captured_at
+        self.results = None
+        self.overlay = None
+
+
+class WorkoutPipeline:
+    """
+    Runs capture, pose estimation, classification and rendering as separate stages.
+
+    Capture, pose and classify each run on their own thread and hand frames on
+    through LatestQueues. Rendering stays on the calling thread because
+    cv2.imshow/waitKey must run on the main thread on macOS.
+
+    tracker must provide:
+        update(results) -> overlay   (runs on the classify thread)
+        draw(image, results, overlay) (runs on the render thread)
+
+    roi: optional core.roi.PoseROI that crops and downsamples frames before
+    pose.process; without it the full frame is converted and processed.
+
+    While paused (pause()/resume() or `with pipeline.paused():`) capture keeps
+    reading the camera so the buffer stays fresh but drops the frames, and
+    classify drops whatever was already in flight, so the tracker sees nothing.
+    """
+
+    def __init__(self, cap, pose, tracker, window_name, wait_ms=1, queue_size=1, roi=None):
+        self.cap = cap
+        self.pose = pose
+        self.roi = roi
+        self.tracker = tracker
+        self.window_name = window_name
+        self.wait_ms = wait_ms
+        self.timer = StageTimer()
+        self.stop_event = threading.Event()
+        self.pause_event = threading.Event()
+        self.capture_failed = False
+        self.error = None
+        self.last_frame_shape = None
+
+        self._pose_queue = LatestQueue(queue_size)
+        self._classify_queue = LatestQueue(queue_size)
+        self._render_queue = LatestQueue(queue_size)
+        self._threads = []
+
+    def _run_stage(self, name, target):
+        try:
+            target()
+        except Exception as e:
+            print(f"Error in {name} stage: {e}")
+            self.error = e
+            self.stop_event.set()
+        finally:
+            # Wake the other stages so they notice the shutdown.
+            if self.stop_event.is_set():
+                for queue in (self._pose_queue, self._classify_queue, self._render_queue):
+                    queue.close()
+
+    def _capture_loop(self):
+        index = 0
+        while not self.stop_event.is_set() and self.cap.isOpened():
+            t0 = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                self.capture_failed = True
+                break
+            if self.pause_event.is_set():
+                continue
+            self.timer.record('capture', time.perf_counter() - t0)
+            self._pose_queue.put(FramePacket(index, frame, t0))
+            index += 1
+        self.stop_event.set()
+
+    def _pose_loop(self):
+        while not self.stop_event.is_set():
+            packet = self._pose_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            t0 = time.perf_counter()
+            if self.roi is not None:
+                packet.results = self.roi.to_frame(self.pose.process(self.roi.prepare(packet.frame)))
+            else:
+                packet.results = self.pose.process(cv2.cvtColor(packet.frame, cv2.COLOR_BGR2RGB))
+            self.timer.record('pose', time.perf_counter() - t0)
+            self._classify_queue.put(packet)
+
+    def _classify_loop(self):
+        while not self.stop_event.is_set():
+            packet = self._classify_queue.get(timeout=0.1)
+            if packet is None or self.pause_event.is_set():
+                continue
+            t0 = time.perf_counter()
+            packet.overlay = self.tracker.update(packet.results)
+            self.timer.record('classify', time.perf_counter() - t0)
+            self._render_queue.put(packet)
+
+    def start(self):
+        for name, target in (('capture', self._capture_loop),
+                             ('pose', self._pose_loop),
+                             ('classify', self._classify_loop)):
+            thread = threading.Thread(target=self._run_stage, args=(name, target), name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def pause(self):
+        self.pause_event.set()
+
+    def resume(self):
+        self.pause_event.clear()
+
+    @contextlib.contextmanager
+    def paused(self):
+        self.pause()
+        try:
+            yield
+        finally:
+            self.resume()
+
+    def stop(self):
+        self.stop_event.set()
+        for queue in (self._pose_queue, self._classify_queue, self._render_queue):
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def run(self, on_tick=None):
+        """
+        Starts the worker stages and renders on the calling thread until 'q' is
+        pressed, capture ends, or on_tick(pipeline) returns False.
+        Exceptions raised inside a worker stage are re-raised here.
+        """
+        self.start()
+        try:
+            while not self.stop_event.is_set():
+                if on_tick is not None and on_tick(self) is False:
+                    break
+                packet = self._render_queue.get(timeout=0.1)
+                if packet is None:
+                    continue
+                t0 = time.perf_counter()
+                self.last_frame_shape = packet.frame.shape
+                self.tracker.draw(packet.frame, packet.results, packet.overlay)
+                cv2.imshow(self.window_name, packet.frame)
+                key = cv2.waitKey(self.wait_ms) & 0xFF
+                now = time.perf_counter()
+                self.timer.record('render', now - t0)
+                self.timer.record('latency', now - packet.captured_at)
+                if key == ord('q'):
+                    break
+        finally:
+            self.stop()
+        if self.error is not None:
+            raise self.error
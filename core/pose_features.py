@@ -0,0 +1,79 @@
+# core/pose_features.py
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# Joint angles as (a, b, c) landmark indices, measured at b in the image (x, y) plane.
+JOINT_ANGLES = {
+    'left_elbow': (11, 13, 15),   # shoulder - elbow - wrist
+    'left_hip': (11, 23, 25),     # shoulder - hip - knee
+    'left_knee': (23, 25, 27),    # hip - knee - ankle
+    'left_body': (11, 23, 27),    # shoulder - hip - ankle
+}
+
+
+def joint_angles(points, a, b, c):
+    """
+    Vectorized angle in degrees (0-180) at b for every (a[i], b[i], c[i]) triplet.
+    points: (..., 33, >=2) array; a, b, c: index arrays of equal length.
+    """
+    pa = points[..., a, :2]
+    pb = points[..., b, :2]
+    pc = points[..., c, :2]
+    radians = (np.arctan2(pc[..., 1] - pb[..., 1], pc[..., 0] - pb[..., 0]) -
+               np.arctan2(pa[..., 1] - pb[..., 1], pa[..., 0] - pb[..., 0]))
+    angle = np.abs(np.degrees(radians))
+    return np.where(angle > 180, 360 - angle, angle)
+
+
+class PoseFeatures:
+    """
+    Computes every configured joint angle (and optionally their angular
+    velocities in degrees/second) for one frame in a single vectorized pass.
+
+    update() takes the frame's landmarks as a flat (99,) array or a (33, 3)
+    array and refreshes self.values: the angles in configuration order,
+    followed by the velocities when enabled.
+    """
+
+    def __init__(self, angles=JOINT_ANGLES, velocities=False):
+        self.names = list(angles)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        triplets = np.array([angles[name] for name in self.names], dtype=np.intp)
+        self._a, self._b, self._c = triplets[:, 0], triplets[:, 1], triplets[:, 2]
+        self.velocities_enabled = velocities
+
+        n = len(self.names)
+        self.values = np.zeros(2 * n if velocities else n, dtype=np.float32)
+        self.angles = self.values[:n]
+        self.velocities = self.values[n:] if velocities else None
+        self.points = None
+        self._prev_angles = np.zeros(n, dtype=np.float32)
+        self._prev_time = None
+
+    def update(self, landmarks, timestamp=None):
+        points = np.asarray(landmarks).reshape(NUM_LANDMARKS, -1)
+        self.points = points
+        if self.velocities_enabled:
+            self._prev_angles[:] = self.angles
+        self.angles[:] = joint_angles(points, self._a, self._b, self._c)
+
+        if self.velocities_enabled:
+            if self._prev_time is not None and timestamp is not None and timestamp > self._prev_time:
+                self.velocities[:] = (self.angles - self._prev_angles) / (timestamp - self._prev_time)
+            else:
+                self.velocities.fill(0)
+            self._prev_time = timestamp
+        return self.values
+
+    def angle(self, name):
+        return float(self.angles[self._index[name]])
+
+    def __getitem__(self, name):
+        return self.angle(name)
+
+    def reset(self):
+        self.values.fill(0)
+        self.points = None
+        self._prev_time = None
@@ -1,32 +1,308 @@
 # classifier/predictor.py
 
+import os
 import numpy as np
 import joblib
 from keras.models import load_model
+from core.landmark_window import LandmarkWindow
+from core.streaming import StreamingBackend
+from core.window_features import window_features
+from core.model_paths import (MODEL_PATH, LABEL_ENCODER_PATH, FORM_MODEL_PATH, FORM_LABEL_ENCODER_PATH,
+                              variant_path)
 
-MODEL_PATH = "classifier/model/workout_classifier.keras"  
-LABEL_ENCODER_PATH = "classifier/model/label_encoder.pkl"  
+# One of: keras, compiled, tflite, onnx, streaming
+INFERENCE_BACKEND = os.environ.get("AI_FITNESS_BACKEND", "compiled")
+# Streaming backend: frames stepped between full-window re-syncs
+STREAMING_RESYNC_EVERY = int(os.environ.get("AI_FITNESS_RESYNC_EVERY", "30"))
+# Max abs difference in class probabilities tolerated against model.predict
+VERIFY_TOLERANCE = 1e-4
+# Streaming backend: drift tolerated on stepped (not re-synced) frames, whose state carries history
+STREAMING_TOLERANCE = float(os.environ.get("AI_FITNESS_STREAMING_TOLERANCE", "0.05"))
+# Compressed model written by classifier.compress: "" (original), float16, int8 or student;
+# or "features" for the summary-feature model from classifier.train_feature_classifier
+MODEL_VARIANT = os.environ.get("AI_FITNESS_MODEL_VARIANT", "")
+# Quantized variants are verified with a looser tolerance than exact exports
+VARIANT_TOLERANCE = {"float16": 1e-2, "int8": 1e-1}
 
-model = load_model(MODEL_PATH)
+
+class KerasBackend:
+    """Reference path: model.predict, including Keras' batching overhead."""
+    name = "keras"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, x):
+        return self.model.predict(x, verbose=0)
+
+
+class CompiledBackend:
+    """Calls the model directly through a traced tf.function, skipping predict()'s per-call setup."""
+    name = "compiled"
+
+    def __init__(self, model):
+        import tensorflow as tf
+
+        self.model = model
+        spec = tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32)
+        self._fn = tf.function(lambda x: model(x, training=False), input_signature=[spec])
+
+    def predict(self, x):
+        return self._fn(x).numpy()
+
+
+class TFLiteBackend:
+    """
+    Runs a TFLite export of the model on the CPU interpreter.
+    The .tflite file is written next to the .keras file and rebuilt when the
+    .keras file is newer. Exports use a fixed batch size of 1.
+    An explicit tflite_path (e.g. a quantized variant from classifier.compress)
+    is used as is; int8 inputs and outputs are (de)quantized here.
+    """
+    name = "tflite"
+
+    def __init__(self, model, model_path, tflite_path=None):
+        self.model = model
+        self.path = tflite_path or os.path.splitext(model_path)[0] + ".tflite"
+        stale = tflite_path is None and os.path.exists(self.path) and os.path.getmtime(self.path) < os.path.getmtime(model_path)
+        if not os.path.exists(self.path) or stale:
+            export_tflite(model, self.path)
+
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=self.path)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._input_scale, self._input_zero = self._input['quantization']
+        self._output_scale, self._output_zero = self._output['quantization']
+        self._quantized_input = self._input['dtype'] != np.float32
+        self._quantized_output = self._output['dtype'] != np.float32
+
+    def predict(self, x):
+        if self._quantized_input:
+            info = np.iinfo(self._input['dtype'])
+            x = np.clip(np.round(x / self._input_scale + self._input_zero), info.min, info.max).astype(self._input['dtype'])
+        self.interpreter.set_tensor(self._input['index'], x)
+        self.interpreter.invoke()
+        y = self.interpreter.get_tensor(self._output['index'])
+        if self._quantized_output:
+            y = (y.astype(np.float32) - self._output_zero) * self._output_scale
+        return y
+
+
+class OnnxBackend:
+    """Runs an ONNX export of the model with ONNX Runtime's CPU provider."""
+    name = "onnx"
+
+    def __init__(self, model, model_path, onnx_path=None):
+        self.model = model
+        self.path = onnx_path or os.path.splitext(model_path)[0] + ".onnx"
+        if not os.path.exists(self.path) or os.path.getmtime(self.path) < os.path.getmtime(model_path):
+            export_onnx(model, self.path)
+
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self._input_name = self.session.get_inputs()[0].name
+
+    def predict(self, x):
+        return self.session.run(None, {self._input_name: x})[0]
+
+
+class FeatureBackend:
+    """
+    Summary-feature classifier (classifier.train_feature_classifier) in place of
+    the LSTM: the window is reduced to core.window_features and scored by a
+    linear model in numpy, or by the saved scikit-learn estimator.
+    """
+    name = "features"
+
+    def __init__(self, path):
+        bundle = joblib.load(path)
+        self.model = bundle['model']
+        self.classes = bundle['classes']
+        self._weights = bundle.get('weights')
+        self._bias = bundle.get('bias')
+
+    def predict(self, x):
+        features = window_features(x)
+        if self._weights is None:
+            return self.model.predict_proba(features)
+        logits = features @ self._weights + self._bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+
+def export_tflite(model, path, quantization=None, representative_data=None):
+    """
+    quantization: None (float32), "float16", "int8" (full integer, needs
+    representative_data: an iterable of (1, 30, 99) float32 windows) or
+    "dynamic" (int8 weights, float activations).
+    """
+    import tensorflow as tf
+
+    spec = tf.TensorSpec((1,) + tuple(model.input_shape[1:]), tf.float32)
+    fn = tf.function(lambda x: model(x, training=False)).get_concrete_function(spec)
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([fn], model)
+    if quantization:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == "int8":
+        converter.representative_dataset = lambda: ([x] for x in representative_data)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+    print(f"Exported {path}")
+
+
+def export_onnx(model, path):
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = (tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="landmarks"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=path)
+    print(f"Exported {path}")
+
+
+BACKENDS = {
+    "keras": lambda model, model_path: KerasBackend(model),
+    "compiled": lambda model, model_path: CompiledBackend(model),
+    "tflite": TFLiteBackend,
+    "onnx": OnnxBackend,
+    "streaming": lambda model, model_path: StreamingBackend(model, STREAMING_RESYNC_EVERY),
+}
+
+
+def verify_backend(backend, samples=8, tolerance=VERIFY_TOLERANCE, seed=0):
+    """
+    Compares backend.predict against model.predict on random landmark windows.
+    Returns the max abs difference; raises ValueError if it exceeds tolerance.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (1,) + tuple(backend.model.input_shape[1:])
+    max_diff = 0.0
+    for _ in range(samples):
+        x = rng.uniform(-1.0, 1.0, size=shape).astype(np.float32)
+        expected = backend.model.predict(x, verbose=0)
+        actual = backend.predict(x)
+        max_diff = max(max_diff, float(np.max(np.abs(expected - actual))))
+    if max_diff > tolerance:
+        raise ValueError(f"{backend.name} backend differs from model.predict by {max_diff:.2e} (tolerance {tolerance:.0e})")
+    return max_diff
+
+
+def verify_streaming(backend, tolerance=STREAMING_TOLERANCE, seed=0):
+    """
+    Checks StreamingBackend's stepped path: streams consecutive one-frame-shifted
+    windows of a smooth random walk (like real landmarks) through it up to its
+    first resync and compares each result with model.predict on the same window.
+    Returns the max abs difference; raises ValueError if it exceeds tolerance.
+    """
+    rng = np.random.default_rng(seed)
+    seq_length, features = backend.model.input_shape[1:]
+    frames = rng.uniform(0.0, 1.0, size=(1, features)) + np.cumsum(
+        rng.normal(0.0, 0.01, size=(seq_length + backend.resync_every, features)), axis=0)
+    frames = frames.astype(np.float32)
+    backend.reset()
+    max_diff = 0.0
+    try:
+        for end in range(seq_length, len(frames) + 1):
+            x = frames[np.newaxis, end - seq_length:end]
+            expected = backend.model.predict(x, verbose=0)
+            max_diff = max(max_diff, float(np.max(np.abs(expected - backend.predict(x)))))
+    finally:
+        backend.reset()
+    if max_diff > tolerance:
+        raise ValueError(f"streaming backend drifts from model.predict by {max_diff:.2e} "
+                         f"within {backend.resync_every} stepped frames (tolerance {tolerance:.0e})")
+    return max_diff
+
+
+def load_classifier(model_path, kind=None, verify=True, variant=None):
+    """
+    Loads a .keras classifier behind the configured inference backend.
+    Falls back to the compiled path and then to model.predict if the requested
+    backend cannot be built or does not match model.predict.
+
+    variant (default MODEL_VARIANT) selects a compressed model from classifier.compress:
+    "student" loads the distilled .keras model behind the usual backends,
+    "float16" / "int8" run the quantized .tflite, "features" the summary-feature
+    model (not verified, it is a different model). Missing or failing variants
+    fall back to the original model. Raises RuntimeError if not even the plain
+    Keras backend works.
+    """
+    kind = kind or INFERENCE_BACKEND
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{kind}'. Expected one of: {', '.join(BACKENDS)}")
+    variant = MODEL_VARIANT if variant is None else variant
+
+    if variant:
+        path = variant_path(model_path, variant)
+        try:
+            if not os.path.exists(path):
+                raise FileNotFoundError("run classifier.compress to create it")
+            if variant == "student":
+                return load_classifier(path, kind, verify, variant="")
+            if variant == "features":
+                return FeatureBackend(path)
+            backend = TFLiteBackend(load_model(model_path), model_path, path)
+            if verify:
+                diff = verify_backend(backend, tolerance=VARIANT_TOLERANCE.get(variant, VERIFY_TOLERANCE))
+                print(f"{os.path.basename(path)}: {variant} variant verified (max diff {diff:.1e})")
+            return backend
+        except Exception as e:
+            print(f"Error using {variant} variant {path}: {e}")
+
+    model = load_model(model_path)
+    error = None
+    for candidate in dict.fromkeys((kind, "compiled", "keras")):
+        try:
+            backend = BACKENDS[candidate](model, model_path)
+            if verify and candidate != "keras":
+                diff = verify_backend(backend)
+                print(f"{os.path.basename(model_path)}: {candidate} backend verified (max diff {diff:.1e})")
+                if candidate == "streaming":
+                    drift = verify_streaming(backend)
+                    print(f"{os.path.basename(model_path)}: streaming steps verified (max drift {drift:.1e})")
+            return backend
+        except Exception as e:
+            print(f"Error using {candidate} backend for {model_path}: {e}")
+            error = e
+    # Even plain model.predict failed: the model itself is unusable.
+    raise RuntimeError(f"No inference backend could be built for {model_path}") from error
+
+
+workout_backend = load_classifier(MODEL_PATH)
+model = workout_backend.model
 label_encoder = joblib.load(LABEL_ENCODER_PATH)
 
 def preprocess_landmarks(landmarks, sequence_length=30):
     """
     landmarks: List or np.array of pose landmarks flattened [x0,y0,z0, x1,y1,z1, ...] for one frame
+               per row, or a LandmarkWindow (returned as a zero-copy view)
     Returns: np.array of shape (1, sequence_length, 99) padded or truncated
     """
+    if isinstance(landmarks, LandmarkWindow) and landmarks.seq_length == sequence_length:
+        return landmarks.batch()
 
-    
-    seq = np.array(landmarks, dtype=np.float32)
-    if len(seq) < sequence_length:
-        # pad with zeros at start
-        pad_len = sequence_length - len(seq)
-        pad = np.zeros((pad_len, seq.shape[1]), dtype=np.float32)
-        seq = np.vstack([pad, seq])
-    elif len(seq) > sequence_length:
-        seq = seq[-sequence_length:]  
-
-    return np.expand_dims(seq, axis=0)  
+    seq = np.asarray(landmarks, dtype=np.float32)
+    # pad with zeros at start, keep the most recent frames when too long
+    out = np.zeros((1, sequence_length, seq.shape[1]), dtype=np.float32)
+    n = min(len(seq), sequence_length)
+    if n:
+        out[0, sequence_length - n:] = seq[len(seq) - n:]
+    return out
 
 def predict_workout_type(landmark_sequence):
     """
@@ -34,7 +310,29 @@ def predict_workout_type(landmark_sequence):
     Returns: predicted label string
     """
     X = preprocess_landmarks(landmark_sequence)
-    preds = model.predict(X) 
+    preds = workout_backend.predict(X)
     pred_label_encoded = np.argmax(preds, axis=1)[0]
     pred_label = label_encoder.inverse_transform([pred_label_encoded])[0]
     return pred_label
+
+if __name__ == "__main__":
+    # Compare every backend against model.predict on both classifiers.
+    import time
+
+    for path in (MODEL_PATH, FORM_MODEL_PATH):
+        for kind in BACKENDS:
+            try:
+                backend = BACKENDS[kind](load_model(path), path)
+                diff = verify_backend(backend, tolerance=np.inf)
+                if kind == "streaming":
+                    print(f"{path} [streaming]: max drift {verify_streaming(backend, tolerance=np.inf):.1e}")
+            except Exception as e:
+                print(f"{path} [{kind}]: unavailable ({e})")
+                continue
+            x = np.zeros((1,) + tuple(backend.model.input_shape[1:]), dtype=np.float32)
+            backend.predict(x)
+            t0 = time.perf_counter()
+            for _ in range(100):
+                backend.predict(x)
+            latency_ms = (time.perf_counter() - t0) * 10.0
+            print(f"{path} [{kind}]: max diff {diff:.1e} | {latency_ms:.2f} ms/sample")
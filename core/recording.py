@@ -0,0 +1,152 @@
+# core/recording.py
+"""
+Crash-safe landmark recordings.
+
+A recording is two files:
+    <name>.lmk    fixed-size binary records appended in chunks:
+                  timestamp (float64, seconds since the epoch),
+                  landmarks (99 x float32, x0 y0 z0 ... x32 y32 z32),
+                  visibility (33 x float32)
+    <name>.json   label, format version, start time; frame count once closed
+
+The sidecar is written before the first frame and every chunk is fsynced, so
+after a crash everything but the last partial chunk is still readable; a torn
+trailing record is ignored. classifier.dataset_store.read_recording (and so
+every training loader) reads .lmk files like CSVs.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from core.landmarks import NUM_LANDMARKS, FEATURE_COUNT
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('landmarks', '<f4', (FEATURE_COUNT,)),
+    ('visibility', '<f4', (NUM_LANDMARKS,)),
+])
+RECORDING_EXTENSION = '.lmk'
+FORMAT_VERSION = 1
+
+
+def sidecar_path(path):
+    return os.path.splitext(path)[0] + '.json'
+
+
+def _write_json(path, data):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(data, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
+
+
+def read_recording_file(path):
+    """Returns (records, metadata): a read-only structured view of every complete record, and the sidecar."""
+    with open(sidecar_path(path)) as f:
+        meta = json.load(f)
+    count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE), meta
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,)), meta
+
+
+class LandmarkRecorder:
+    """
+    Appends landmark frames to a .lmk file without blocking the capture loop.
+
+    Frames are written into a preallocated chunk; full chunks are handed to a
+    writer thread that appends, flushes and fsyncs them while capture goes on.
+
+        recorder = LandmarkRecorder('data/collected_data/curls_20250101_120000.lmk', 'curls')
+        row, vis = recorder.next_frame(timestamp)
+        landmarks_into(results.pose_landmarks, row, vis)
+        ...
+        recorder.close()
+    """
+
+    def __init__(self, path, label, chunk_frames=64):
+        self.path = path
+        self.label = label
+        self.chunk_frames = chunk_frames
+        self.frames = 0
+        self.error = None
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        self._meta = {'label': label, 'version': FORMAT_VERSION, 'started_at': time.time(),
+                      'frames': None, 'complete': False}
+        _write_json(sidecar_path(path), self._meta)
+        self._file = open(path, 'ab')
+
+        self._free = queue.Queue()
+        for _ in range(3):
+            self._free.put(np.zeros(chunk_frames, dtype=RECORD_DTYPE))
+        self._full = queue.Queue()
+        self._chunk = self._free.get()
+        self._used = 0
+        self._writer = threading.Thread(target=self._write_loop, name="landmark-recorder", daemon=True)
+        self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                return
+            chunk, used = item
+            try:
+                self._file.write(chunk[:used].tobytes())
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                print(f"Error writing {self.path}: {e}")
+                self.error = e
+            self._free.put(chunk)
+
+    def _hand_off(self):
+        if self._used:
+            self._full.put((self._chunk, self._used))
+            # Blocks only if the writer is two chunks behind.
+            self._chunk = self._free.get()
+            self._used = 0
+
+    def next_frame(self, timestamp=None):
+        """Reserves the next record; returns its (landmarks (99,), visibility (33,)) buffers to fill in place."""
+        if self._used == self.chunk_frames:
+            self._hand_off()
+        i = self._used
+        self._chunk['timestamp'][i] = time.time() if timestamp is None else timestamp
+        self._used += 1
+        self.frames += 1
+        return self._chunk['landmarks'][i], self._chunk['visibility'][i]
+
+    def add(self, landmarks, visibility=None, timestamp=None):
+        row, vis = self.next_frame(timestamp)
+        row[:] = landmarks
+        vis[:] = 1.0 if visibility is None else visibility
+
+    def close(self, complete=True):
+        """
+        Writes the last partial chunk and stops the writer. The sidecar marks the
+        recording complete unless complete is False or a write failed.
+        """
+        if self._file is None:
+            return
+        self._hand_off()
+        self._full.put(None)
+        self._writer.join()
+        self._file.close()
+        self._file = None
+        self._meta.update(frames=self.frames, complete=complete and self.error is None, finished_at=time.time())
+        _write_json(sidecar_path(self.path), self._meta)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # A recording cut short by an exception keeps its frames but isn't complete.
+        self.close(complete=exc_type is None)
@@ -0,0 +1,96 @@
+# core/roi.py
+
+import os
+
+import cv2
+import numpy as np
+
+# Longest side (pixels) of the image handed to pose.process
+POSE_INPUT_SIZE = int(os.environ.get("AI_FITNESS_POSE_SIZE", "640"))
+
+
+class PoseROI:
+    """
+    Crops each frame to a padded box around the previous frame's landmarks and
+    downsamples it before pose estimation, then maps the landmarks back to
+    full-frame normalized coordinates so the rest of the code (and the
+    classifiers, trained on full-frame coordinates) is unaffected.
+
+    The crop only moves when the body gets close to its edge or occupies much
+    less of it, which keeps MediaPipe's own frame-to-frame tracking stable.
+    With no landmarks the full frame is used.
+
+    Usage (one instance per video stream, same thread):
+        rgb = roi.prepare(frame_bgr)
+        results = pose.process(rgb)
+        roi.to_frame(results)
+    """
+
+    def __init__(self, input_size=POSE_INPUT_SIZE, padding=0.3, margin=0.1, min_fraction=0.25):
+        self.input_size = input_size
+        self.padding = padding
+        self.margin = margin
+        self.min_fraction = min_fraction
+        self.box = None          # (x0, y0, x1, y1) in pixels, None = full frame
+        self._frame_size = None
+        self._crop = None
+
+    def reset(self):
+        self.box = None
+
+    def prepare(self, frame_bgr):
+        """Returns the cropped, resized RGB image to pass to pose.process."""
+        h, w = frame_bgr.shape[:2]
+        if self._frame_size != (w, h):
+            self._frame_size = (w, h)
+            self.box = None
+        x0, y0, x1, y1 = self.box or (0, 0, w, h)
+        self._crop = (x0, y0, x1 - x0, y1 - y0)
+
+        crop = frame_bgr[y0:y1, x0:x1]
+        scale = self.input_size / max(crop.shape[:2])
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, round(crop.shape[1] * scale)), max(1, round(crop.shape[0] * scale))),
+                              interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+
+    def to_frame(self, results):
+        """Maps results.pose_landmarks back to full-frame coordinates in place and updates the crop."""
+        if not results.pose_landmarks:
+            self.box = None
+            return results
+
+        w, h = self._frame_size
+        cx, cy, cw, ch = self._crop
+        xs = np.empty(len(results.pose_landmarks.landmark), dtype=np.float32)
+        ys = np.empty_like(xs)
+        for i, lm in enumerate(results.pose_landmarks.landmark):
+            lm.x = (cx + lm.x * cw) / w
+            lm.y = (cy + lm.y * ch) / h
+            lm.z = lm.z * cw / w
+            xs[i] = lm.x
+            ys[i] = lm.y
+
+        self._update_box(xs.min() * w, ys.min() * h, xs.max() * w, ys.max() * h)
+        return results
+
+    def _update_box(self, bx0, by0, bx1, by1):
+        w, h = self._frame_size
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            mx = self.margin * (x1 - x0)
+            my = self.margin * (y1 - y0)
+            inside = bx0 >= x0 + mx and by0 >= y0 + my and bx1 <= x1 - mx and by1 <= y1 - my
+            body_area = (bx1 - bx0) * (by1 - by0)
+            if inside and body_area >= self.min_fraction * (x1 - x0) * (y1 - y0):
+                return
+
+        pad = self.padding * max(bx1 - bx0, by1 - by0)
+        x0 = int(max(0, bx0 - pad))
+        y0 = int(max(0, by0 - pad))
+        x1 = int(min(w, bx1 + pad))
+        y1 = int(min(h, by1 + pad))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            self.box = None
+        else:
+            self.box = (x0, y0, x1, y1)
@@ -0,0 +1,94 @@
+# core/scheduler.py
+
+import time
+
+import numpy as np
+
+# Default policy; any key can be overridden through ClassifierScheduler(**overrides).
+DEFAULT_POLICY = {
+    # Mean landmark displacement (normalized x/y units) since the last prediction
+    # that forces a new one.
+    'motion_threshold': 0.02,
+    # Never predict more often than this (seconds)...
+    'min_interval': 0.0,
+    # ...and never reuse a prediction for longer than this.
+    'max_interval': 0.5,
+    # Predictions below this confidence are not reused.
+    'confidence_threshold': 0.8,
+}
+
+
+class ClassifierScheduler:
+    """
+    Decides per frame whether the LSTM classifiers need to run or whether the
+    cached prediction from the last run can be reused.
+
+    A new prediction runs when there is none yet, when the landmarks have moved
+    more than motion_threshold since the last run, when the last result was
+    less confident than confidence_threshold, or when it is older than
+    max_interval. Nothing runs within min_interval of the last run.
+
+        if scheduler.should_run(frame, now):
+            probs = model.predict(window)
+            scheduler.record(frame, now, probs.max())
+    """
+
+    def __init__(self, clock=time.time, **policy):
+        unknown = set(policy) - set(DEFAULT_POLICY)
+        if unknown:
+            raise ValueError(f"Unknown scheduler settings: {', '.join(sorted(unknown))}")
+        self.policy = {**DEFAULT_POLICY, **policy}
+        self.clock = clock
+        self.runs = 0
+        self.skips = 0
+        self._reference = None
+        self._last_run = None
+        self._confidence = 0.0
+
+    def reset(self):
+        self._reference = None
+        self._last_run = None
+        self._confidence = 0.0
+
+    def motion(self, frame):
+        """Mean x/y displacement of the landmarks since the last prediction."""
+        if self._reference is None:
+            return np.inf
+        points = np.asarray(frame).reshape(-1, 3)[:, :2]
+        return float(np.abs(points - self._reference).mean())
+
+    def should_run(self, frame, now=None):
+        now = self.clock() if now is None else now
+        policy = self.policy
+        if self._last_run is None:
+            run = True
+        else:
+            elapsed = now - self._last_run
+            if elapsed < policy['min_interval']:
+                run = False
+            else:
+                run = (elapsed >= policy['max_interval'] or
+                       self._confidence < policy['confidence_threshold'] or
+                       self.motion(frame) >= policy['motion_threshold'])
+        if run:
+            self.runs += 1
+        else:
+            self.skips += 1
+        return run
+
+    def record(self, frame, now=None, confidence=1.0):
+        """Stores the frame, time and confidence of the prediction that just ran."""
+        points = np.asarray(frame).reshape(-1, 3)[:, :2]
+        if self._reference is None:
+            self._reference = np.empty_like(points, dtype=np.float32)
+        self._reference[:] = points
+        self._last_run = self.clock() if now is None else now
+        self._confidence = float(confidence)
+
+    @property
+    def skip_rate(self):
+        total = self.runs + self.skips
+        return self.skips / total if total else 0.0
+
+    def report(self, name="Classifier"):
+        print(f"{name} scheduler: {self.runs} runs, {self.skips} skipped ({self.skip_rate:.0%})")
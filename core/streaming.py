@@ -0,0 +1,170 @@
+# core/streaming.py
+
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _relu(x):
+    return np.maximum(x, 0.0)
+
+
+def _softmax(x):
+    e = np.exp(x - x.max())
+    return e / e.sum()
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {'relu': _relu, 'softmax': _softmax, 'linear': _linear, 'sigmoid': _sigmoid, 'tanh': np.tanh}
+
+
+class _LSTMCell:
+    """One Keras LSTM layer (tanh / sigmoid, gate order i, f, c, o) advanced a timestep at a time."""
+
+    def __init__(self, kernel, recurrent_kernel, bias):
+        self.kernel = kernel.astype(np.float32)
+        self.recurrent_kernel = recurrent_kernel.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.units = recurrent_kernel.shape[0]
+        self.h = np.zeros(self.units, dtype=np.float32)
+        self.c = np.zeros(self.units, dtype=np.float32)
+
+    def reset(self):
+        self.h.fill(0)
+        self.c.fill(0)
+
+    def step(self, x):
+        u = self.units
+        z = x @ self.kernel + self.h @ self.recurrent_kernel + self.bias
+        i = _sigmoid(z[:u])
+        f = _sigmoid(z[u:2 * u])
+        g = np.tanh(z[2 * u:3 * u])
+        o = _sigmoid(z[3 * u:])
+        self.c = f * self.c + i * g
+        self.h = o * np.tanh(self.c)
+        return self.h
+
+
+class StreamingLSTMClassifier:
+    """
+    Stateful re-implementation of the stacked LSTM classifiers built from the
+    trained Keras weights (Dropout is a no-op at inference and is skipped).
+
+    step(frame) advances every LSTM layer by one timestep and runs the dense
+    head, so a new frame costs one timestep instead of the full window.
+    The trained models always start each window from a zero state, while the
+    streaming state carries history from before the window; to limit that
+    drift, sync(window) re-runs the window from a zero state, which gives
+    exactly the full-window result.
+    """
+
+    def __init__(self, model):
+        self.cells = []
+        self.head = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind == 'LSTM':
+                if self.head:
+                    raise ValueError("LSTM layers after the dense head are not supported")
+                self.cells.append(_LSTMCell(*layer.get_weights()))
+            elif kind == 'Dense':
+                weights, bias = layer.get_weights()
+                activation = layer.get_config().get('activation', 'linear')
+                if activation not in ACTIVATIONS:
+                    raise ValueError(f"Unsupported Dense activation '{activation}'")
+                self.head.append((weights.astype(np.float32), bias.astype(np.float32), ACTIVATIONS[activation]))
+            elif kind not in ('Dropout', 'InputLayer'):
+                raise ValueError(f"Unsupported layer type '{kind}' for streaming inference")
+        if not self.cells or not self.head:
+            raise ValueError("Model must contain LSTM layers followed by Dense layers")
+
+    def reset(self):
+        for cell in self.cells:
+            cell.reset()
+
+    def _advance(self, frame):
+        x = frame
+        for cell in self.cells:
+            x = cell.step(x)
+        return x
+
+    def _classify(self, h):
+        x = h
+        for weights, bias, activation in self.head:
+            x = activation(x @ weights + bias)
+        return x
+
+    def step(self, frame):
+        """Consumes one (num_features,) frame and returns class probabilities."""
+        return self._classify(self._advance(np.asarray(frame, dtype=np.float32)))
+
+    def sync(self, window):
+        """Re-runs a (seq_length, num_features) window from a zero state; matches the full model."""
+        self.reset()
+        h = None
+        for frame in np.asarray(window, dtype=np.float32):
+            h = self._advance(frame)
+        return self._classify(h)
+
+
+class StreamingBackend:
+    """
+    Inference backend around StreamingLSTMClassifier.
+
+    predict(x) takes the same (1, seq_length, num_features) window as the other
+    backends. When x is the previous window shifted by k new frames (k less
+    than the window length), only those k frames are stepped; otherwise (first
+    call, a gap longer than the window, unrelated input) or once resync_every
+    frames have been stepped since the last sync, the whole window is re-run
+    from a zero state.
+
+    The trackers only classify every few frames (core.trackers' scheduler), so
+    in practice windows arrive shifted by several frames; stepping those costs
+    k timesteps instead of seq_length. predict.verify_streaming bounds the drift
+    of the stepped path against model.predict.
+    """
+    name = "streaming"
+
+    def __init__(self, model, resync_every=30):
+        self.model = model
+        self.classifier = StreamingLSTMClassifier(model)
+        self.resync_every = resync_every
+        self._last_frame = None
+        self._since_sync = 0
+        self.steps = 0
+        self.syncs = 0
+
+    def reset(self):
+        """Forgets the previous window, so the next predict re-syncs."""
+        self._last_frame = None
+
+    def _shift(self, window):
+        """How many new frames window has on top of the previous one, or None if it doesn't continue it."""
+        if self._last_frame is None:
+            return None
+        for k in range(1, len(window)):
+            if np.array_equal(window[-1 - k], self._last_frame):
+                return k
+        return None
+
+    def predict(self, x):
+        window = x[0]
+        shift = self._shift(window)
+        if shift is not None and self._since_sync + shift <= self.resync_every:
+            for frame in window[-shift:]:
+                probs = self.classifier.step(frame)
+            self._since_sync += shift
+            self.steps += 1
+        else:
+            probs = self.classifier.sync(window)
+            self._since_sync = 0
+            self.syncs += 1
+        if self._last_frame is None:
+            self._last_frame = np.empty_like(window[-1])
+        self._last_frame[:] = window[-1]
+        return probs[np.newaxis]
@@ -0,0 +1,38 @@
+# core/threads.py
+"""
+Thread limits for worker process pools (classifier.sweep, core.offline).
+
+    with limit_threads(2), ProcessPoolExecutor(mp_context=spawn_context) as pool:
+        ...
+
+The environment has to be in place before a worker starts: a spawned worker
+imports numpy (and with it the BLAS thread pools) while unpickling its first
+task, before any pool initializer runs.
+"""
+
+import contextlib
+import os
+
+THREAD_ENV = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+              'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS')
+
+
+@contextlib.contextmanager
+def limit_threads(threads, cpu_only=False):
+    """
+    Sets THREAD_ENV (and CUDA_VISIBLE_DEVICES=-1 with cpu_only) for processes
+    started inside the block; the previous environment is restored afterwards.
+    """
+    limits = {var: str(threads) for var in THREAD_ENV}
+    if cpu_only:
+        limits['CUDA_VISIBLE_DEVICES'] = '-1'
+    saved = {var: os.environ.get(var) for var in limits}
+    os.environ.update(limits)
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
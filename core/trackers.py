@@ -0,0 +1,406 @@
+# core/trackers.py
+
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from core.landmark_window import LandmarkWindow
+from core.landmarks import landmarks_into
+from core.pose_features import PoseFeatures
+from core.predictor import workout_backend, label_encoder
+from core.scheduler import ClassifierScheduler
+
+mp_drawing = mp.solutions.drawing_utils
+mp_pose = mp.solutions.pose
+
+WORKOUT_CONFIG = {
+    'curls': {
+        'angles': ['left_elbow'],
+        'angle_ranges': {'up': (160, 180), 'down': (0, 30)},
+        'calories_per_rep': 0.5,
+        'form_labels': ['curlsgood', 'curlsbad']
+    },
+    'pushups': {
+        'angles': ['left_elbow', 'left_body'],
+        'angle_ranges': {'up': (150, 180, 175, 183), 'down': (0, 90, None, None)},
+        'extra_condition': lambda points: points[11, 1] < 0.4,
+        'calories_per_rep': 0.5,
+        'form_labels': ['pushupsgood', 'pushupsbad']
+    },
+    'situps': {
+        'angles': ['left_hip'],
+        'angle_ranges': {'up': (120, 180), 'down': (0, 75)},
+        'calories_per_rep': 0.6,
+        'form_labels': ['situpsgood', 'situpsbad']
+    },
+    'squats': {
+        'angles': ['left_knee'],
+        'angle_ranges': {'up': (150, 180), 'down': (0, 90)},
+        'calories_per_rep': 0.7,
+        'form_labels': ['squatsgood', 'squatsbad']
+    },
+    'plank': {
+        'angles': ['left_body'],
+        'angle_ranges': {'plank': (170, 190)},
+        'extra_condition': lambda points: points[11, 1] > 0.6 and points[23, 1] > 0.6,
+        'calories_per_second': 0.05,
+        'form_labels': ['plankgood', 'plankbad']
+    }
+}
+
+WORKOUT_MAP = {
+    'curl': 'curls',
+    'squat': 'squats',
+    'pushup': 'pushups',
+    'situp': 'situps',
+    'plank': 'plank'
+}
+
+class WorkoutTracker:
+    """
+    Rep counting and form state for a single selected workout.
+    update() runs on the pipeline's classify stage, draw() on the render stage.
+    clock supplies the current time in seconds; offline processing passes the
+    video timestamp so plank timing and rep times follow the recording.
+    scheduler decides which frames run the form classifier; the others reuse
+    the last prediction.
+    """
+
+    def __init__(self, workout_type, form_model=None, form_label_encoder=None, seq_length=30, clock=time.time,
+                 scheduler=None):
+        self.workout_type = workout_type
+        self.form_model = form_model
+        self.form_label_encoder = form_label_encoder
+        self.clock = clock
+        self.scheduler = scheduler or ClassifierScheduler(clock=clock)
+        self._cached_form = None
+        self.config = WORKOUT_CONFIG[workout_type]
+        self.seq_length = seq_length
+        self.window = LandmarkWindow(seq_length)
+        self.features = PoseFeatures()
+        self.rep_counts = {
+            'curls': 0, 'pushups': 0, 'situps': 0, 'squats': 0,
+            'curls_good': 0, 'curls_bad': 0,
+            'pushups_good': 0, 'pushups_bad': 0,
+            'situps_good': 0, 'situps_bad': 0,
+            'squats_good': 0, 'squats_bad': 0
+        }
+        self.calories = 0.0
+        self.stage = None
+        self.plank_start_time = None
+        self.plank_total_time = 0
+        self.in_plank_position = False
+        self.rep_log = []
+
+    def predict_form(self):
+        if self.form_model is None or self.form_label_encoder is None:
+            return None
+        frame = self.window.latest()
+        now = self.clock()
+        if not self.scheduler.should_run(frame, now):
+            return self._cached_form
+        input_data = self.window.batch()
+        try:
+            form_probs = self.form_model.predict(input_data)
+            self._cached_form = self.form_label_encoder.inverse_transform(np.argmax(form_probs, axis=1))[0]
+            self.scheduler.record(frame, now, form_probs.max())
+        except Exception as e:
+            print(f"Error predicting form: {e}")
+            self._cached_form = None
+        return self._cached_form
+
+    def joint_angles(self):
+        return [self.features[name] for name in self.config['angles']]
+
+    def update(self, results):
+        """Consumes one pose result and returns the form label to display (or None)."""
+        if not results.pose_landmarks:
+            return None
+        landmarks_into(results.pose_landmarks, self.window.next_row())
+        self.window.commit()
+        return self._process_frame()
+
+    def update_row(self, row):
+        """Same as update() for a frame already flattened to 99 floats (replays, stored recordings)."""
+        self.window.push(row)
+        return self._process_frame()
+
+    def _process_frame(self):
+        config = self.config
+        workout_type = self.workout_type
+        form_pred_label = None
+        landmarks = self.window.latest()
+        self.features.update(landmarks)
+        points = self.features.points
+
+        if workout_type != 'plank' and self.window.full:
+            form_pred_label = self.predict_form()
+            angles = self.joint_angles()
+
+            if not form_pred_label or form_pred_label not in config['form_labels']:
+                if workout_type == 'pushups':
+                    back_angle = angles[1] if len(angles) > 1 else 180
+                    form_pred_label = "pushupsgood" if 175 <= back_angle <= 183 and angles[0] > 165 and points[11, 1] < 0.35 else "pushupsbad"
+                elif workout_type == 'curls':
+                    form_pred_label = "curlsgood" if angles[0] < 25 or angles[0] > 170 else "curlsbad"
+                elif workout_type == 'situps':
+                    form_pred_label = "situpsgood" if angles[0] < 50 else "situpsbad"
+                elif workout_type == 'squats':
+                    form_pred_label = "squatsgood" if angles[0] < 70 else "squatsbad"
+
+            if 'angle_ranges' in config:
+                up_range = config['angle_ranges']['up']
+                down_range = config['angle_ranges']['down']
+                main_angle = angles[0]
+                extra_condition = config.get('extra_condition', lambda points: True)
+
+                if (up_range[0] <= main_angle <= up_range[1] and
+                        (len(up_range) <= 2 or (up_range[2] <= angles[1] <= up_range[3] if len(angles) > 1 else True))):
+                    self.stage = "up"
+                if (down_range[0] <= main_angle <= down_range[1] and self.stage == "up" and
+                        extra_condition(points)):
+                    self.stage = "down"
+                    self.rep_counts[workout_type] += 1
+                    self.rep_counts[f"{workout_type}_good" if form_pred_label.endswith("good") else f"{workout_type}_bad"] += 1
+                    self.calories += config['calories_per_rep']
+                    self.rep_log.append({
+                        'exercise': workout_type,
+                        'rep': self.rep_counts[workout_type],
+                        'form': 'good' if form_pred_label.endswith("good") else 'bad',
+                        'time': round(self.clock(), 3),
+                    })
+                    print(f"{workout_type.capitalize()} #{self.rep_counts[workout_type]} | Form: {'Good' if form_pred_label.endswith('good') else 'Bad'} | 🔥 {self.calories:.1f} cal")
+
+        elif workout_type == 'plank':
+            angles = self.joint_angles()
+
+            plank_angle = angles[0] if angles else 180
+            extra_condition = config.get('extra_condition', lambda points: True)
+            self.in_plank_position = (config['angle_ranges']['plank'][0] <= plank_angle <= config['angle_ranges']['plank'][1] and
+                                      extra_condition(points))
+
+            if self.window.full:
+                form_pred_label = self.predict_form()
+                if not form_pred_label or form_pred_label not in config['form_labels']:
+                    form_pred_label = "plankgood" if self.in_plank_position else "plankbad"
+
+            now = self.clock()
+            if self.in_plank_position:
+                if self.plank_start_time is None:
+                    self.plank_start_time = now
+                self.plank_total_time += now - self.plank_start_time
+                self.calories += (now - self.plank_start_time) * config['calories_per_second']
+                print(f"Plank active: {int(self.plank_total_time)} sec | 🔥 {self.calories:.1f} cal")
+            else:
+                if self.plank_start_time is not None:
+                    print("⏸️ Plank paused: Not in plank position")
+            self.plank_start_time = now if self.in_plank_position else None
+
+        return form_pred_label
+
+    def draw(self, img_bgr, results, form_pred_label):
+        if results is None or not results.pose_landmarks:
+            return
+
+        workout_type = self.workout_type
+        mp_drawing.draw_landmarks(img_bgr, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
+
+        if form_pred_label:
+            border_color = (0, 255, 0) if form_pred_label.endswith("good") else (0, 0, 255)
+            cv2.rectangle(img_bgr, (0, 0), (img_bgr.shape[1], img_bgr.shape[0]), border_color, 10)
+
+        y = 30
+        if workout_type != 'plank':
+            cv2.putText(img_bgr, f"{workout_type}: {self.rep_counts[workout_type]}", 
+                        (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            y += 30
+            cv2.putText(img_bgr, f"Good: {self.rep_counts[f'{workout_type}_good']}", 
+                        (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            y += 30
+            cv2.putText(img_bgr, f"Bad: {self.rep_counts[f'{workout_type}_bad']}", 
+                        (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+            y += 30
+        else:
+            status = "Active" if self.in_plank_position else "Paused"
+            cv2.putText(img_bgr, f"Plank: {status}", (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            y += 30
+            cv2.putText(img_bgr, f"Time: {int(self.plank_total_time)} sec", (10, y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            y += 30
+        cv2.putText(img_bgr, f"Calories: {self.calories:.1f}", (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+
+class FreeForAllTracker:
+    """
+    Detects the current exercise and counts its reps.
+    update() runs on the pipeline's classify stage, draw() on the render stage.
+    announce(text) is called when the detected exercise has been stable for a
+    while (the live mode passes mood_check.speak); clock and scheduler work as
+    in WorkoutTracker, with the scheduler gating both classifiers.
+    """
+
+    def __init__(self, form_model, form_label_encoder, seq_length=30, clock=time.time, announce=None,
+                 scheduler=None):
+        self.form_model = form_model
+        self.form_label_encoder = form_label_encoder
+        self.clock = clock
+        self.announce = announce
+        self.scheduler = scheduler or ClassifierScheduler(clock=clock)
+        self._cached_labels = None
+        self.seq_length = seq_length
+        self.window = LandmarkWindow(seq_length)
+        self.features = PoseFeatures()
+
+        self.current_workout = None
+        self.last_change_time = clock()
+        self.stable_duration_required = 5.0
+
+        self.rep_counts = {
+        'curls': 0, 
+        'pushups': 0, 
+        'situps': 0,
+        'squats': 0,
+        'pushups_good': 0,
+        'pushups_bad': 0,
+        'curls_good': 0,
+        'curls_bad': 0,
+        'situps_good': 0,
+        'situps_bad': 0,
+        'squats_good': 0,
+        'squats_bad': 0}
+        self.calories = 0.0
+        self.stages = {'curls': None, 'pushups': None, 'situps': None, 'squats': None}
+        self.rep_log = []
+
+    def _log_rep(self, exercise, form_pred_label):
+        self.rep_log.append({
+            'exercise': exercise,
+            'rep': self.rep_counts[exercise],
+            'form': 'good' if form_pred_label.endswith("good") else 'bad',
+            'time': round(self.clock(), 3),
+        })
+
+    def update(self, results):
+        """Consumes one pose result and returns the form label for the border (or None)."""
+        if not results.pose_landmarks:
+            return None
+        landmarks_into(results.pose_landmarks, self.window.next_row())
+        self.window.commit()
+        return self._process_frame()
+
+    def update_row(self, row):
+        """Same as update() for a frame already flattened to 99 floats (replays, stored recordings)."""
+        self.window.push(row)
+        return self._process_frame()
+
+    def _process_frame(self):
+        rep_counts = self.rep_counts
+        stages = self.stages
+        landmarks = self.window.latest()
+        if not self.window.full:
+            return None
+
+        features = self.features
+        features.update(landmarks)
+        points = features.points
+
+        now = self.clock()
+        # Always consult the scheduler so its run/skip counts cover every frame.
+        run = self.scheduler.should_run(landmarks, now)
+        if run or self._cached_labels is None:
+            input_data = self.window.batch()
+            workout_probs = workout_backend.predict(input_data)
+            form_probs = self.form_model.predict(input_data)
+            self._cached_labels = (
+                label_encoder.inverse_transform([np.argmax(workout_probs)])[0],
+                self.form_label_encoder.inverse_transform(np.argmax(form_probs, axis=1))[0],
+            )
+            self.scheduler.record(landmarks, now, min(workout_probs.max(), form_probs.max()))
+        pred_label, form_pred_label = self._cached_labels
+
+
+        if pred_label == "pushups":
+            back_angle = features['left_body']
+            elbow_angle = features['left_elbow']
+            shoulder_y = points[11, 1]
+            form_pred_label = "pushupsgood" if 175 <= back_angle <= 183 and elbow_angle > 165 and shoulder_y < 0.35 else "pushupsbad"
+
+            if elbow_angle < 90 and shoulder_y > 0.6:
+                stages['pushups'] = "down"
+            if elbow_angle > 150 and shoulder_y < 0.4 and stages['pushups'] == "down":
+                stages['pushups'] = "up"
+                rep_counts['pushups_good' if form_pred_label == "pushupsgood" else 'pushups_bad'] += 1
+                rep_counts['pushups'] += 1
+                self._log_rep('pushups', form_pred_label)
+                self.calories += 0.5
+                print(f"Push-up #{rep_counts['pushups']} | {self.calories:.1f} cal")
+
+        elif pred_label == "curls":
+            angle = features['left_elbow']
+
+            form_pred_label = "curlsgood" if angle < 25 or angle > 170 else "curlsbad"
+            if angle > 160:
+                stages['curls'] = "down"
+            if angle < 30 and stages['curls'] == "down":
+                stages['curls'] = "up"
+                rep_counts['curls_good' if form_pred_label == "curlsgood" else 'curls_bad'] += 1
+                rep_counts['curls'] += 1
+                self._log_rep('curls', form_pred_label)
+                self.calories += 0.5
+                print(f"Curl #{rep_counts['curls']} |{self.calories:.1f} cal")
+
+
+        elif pred_label == "situps":
+            angle = features['left_hip']
+
+            form_pred_label = "situpsgood" if angle < 50 else "situpsbad"
+            if angle > 120:
+                stages['situps'] = "down"
+            if angle < 75 and stages['situps'] == "down":
+                stages['situps'] = "up"
+                rep_counts['situps_good' if form_pred_label == "situpsgood" else 'situps_bad'] += 1
+                rep_counts['situps'] += 1
+                self._log_rep('situps', form_pred_label)
+                self.calories += 0.6
+                print(f"Sit-up #{rep_counts['situps']} | {self.calories:.1f} cal")
+
+        elif pred_label == "squats":
+            angle = features['left_knee']
+
+            form_pred_label = "squatsgood" if angle < 70 else "squatsbad"
+
+            if angle > 150:
+                stages['squats'] = "up"
+            if angle < 90 and stages['squats'] == "up":
+                stages['squats'] = "down"
+                rep_counts['squats_good' if form_pred_label == "squatsgood" else 'squats_bad'] += 1
+                rep_counts['squats'] += 1
+                self._log_rep('squats', form_pred_label)
+                self.calories += 0.7
+                print(f"Squat #{rep_counts['squats']} | {self.calories:.1f} cal")
+
+
+        if pred_label != self.current_workout:
+            self.current_workout = pred_label
+            self.last_change_time = self.clock()
+            if self.current_workout in stages:
+                stages[self.current_workout] = None
+
+        current_time = self.clock()
+        if current_time - self.last_change_time >= self.stable_duration_required:
+            if self.announce is not None:
+                self.announce(f"Now you're doing {self.current_workout}")
+            self.last_change_time = current_time + 10000
+
+        return form_pred_label
+
+    def draw(self, frame, results, form_pred_label):
+        if form_pred_label:
+            border_color = (0, 255, 0) if form_pred_label.endswith("good") else (0, 0, 255)
+            cv2.rectangle(frame, (0, 0), (frame.shape[1], frame.shape[0]), border_color, 10)
+
+        y = 30
+        for workout, count in self.rep_counts.items():
+            cv2.putText(frame, f"{workout}: {count}", (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            y += 30
+        cv2.putText(frame, f"Calories: {self.calories:.1f}", (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
@@ -0,0 +1,83 @@
+# core/window_features.py
+"""
+Compact summary of a landmark window for the fast (non-LSTM) classifiers.
+
+Per frame: joint angles on both sides, torso incline from vertical, and
+landmark distances divided by the torso length (so they do not depend on how
+far the user stands from the camera). Per window: mean, std, min, max, range
+and last value of every series, plus mean and max absolute angular velocity
+(degrees per frame).
+"""
+
+import numpy as np
+
+from core.pose_features import joint_angles
+
+NUM_LANDMARKS = 33
+
+FEATURE_ANGLES = {
+    'left_elbow': (11, 13, 15),
+    'right_elbow': (12, 14, 16),
+    'left_shoulder': (13, 11, 23),
+    'right_shoulder': (14, 12, 24),
+    'left_hip': (11, 23, 25),
+    'right_hip': (12, 24, 26),
+    'left_knee': (23, 25, 27),
+    'right_knee': (24, 26, 28),
+    'left_body': (11, 23, 27),
+    'right_body': (12, 24, 28),
+}
+
+FEATURE_DISTANCES = {
+    'left_wrist_shoulder': (15, 11),
+    'right_wrist_shoulder': (16, 12),
+    'left_wrist_hip': (15, 23),
+    'right_wrist_hip': (16, 24),
+    'left_ankle_hip': (27, 23),
+    'right_ankle_hip': (28, 24),
+    'shoulder_width': (11, 12),
+    'wrist_width': (15, 16),
+    'ankle_width': (27, 28),
+}
+
+_TRIPLETS = np.array(list(FEATURE_ANGLES.values()), dtype=np.intp)
+_A, _B, _C = _TRIPLETS[:, 0], _TRIPLETS[:, 1], _TRIPLETS[:, 2]
+_PAIRS = np.array(list(FEATURE_DISTANCES.values()), dtype=np.intp)
+_P, _Q = _PAIRS[:, 0], _PAIRS[:, 1]
+_SHOULDERS = np.array([11, 12])
+_HIPS = np.array([23, 24])
+
+ANGLE_SERIES = list(FEATURE_ANGLES) + ['torso_incline']
+SERIES = ANGLE_SERIES + list(FEATURE_DISTANCES)
+STATS = ('mean', 'std', 'min', 'max', 'range', 'last')
+FEATURE_NAMES = ([f"{name}_{stat}" for stat in STATS for name in SERIES] +
+                 [f"{name}_speed_{stat}" for stat in ('mean', 'max') for name in ANGLE_SERIES])
+
+
+def window_features(windows):
+    """
+    windows: (30, 99) or (batch, 30, 99) landmark windows.
+    Returns (batch, len(FEATURE_NAMES)) float32 features.
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    if windows.ndim == 2:
+        windows = windows[None]
+    points = windows.reshape(windows.shape[0], windows.shape[1], NUM_LANDMARKS, 3)
+
+    angles = joint_angles(points, _A, _B, _C)
+    torso = points[..., _SHOULDERS, :2].mean(axis=-2) - points[..., _HIPS, :2].mean(axis=-2)
+    torso_length = np.maximum(np.linalg.norm(torso, axis=-1), 1e-6)
+    incline = np.degrees(np.arctan2(np.abs(torso[..., 0]), np.abs(torso[..., 1])))
+    angle_series = np.concatenate([angles, incline[..., None]], axis=-1)
+
+    distances = np.linalg.norm(points[..., _P, :2] - points[..., _Q, :2], axis=-1) / torso_length[..., None]
+    series = np.concatenate([angle_series, distances], axis=-1)
+
+    low = series.min(axis=1)
+    high = series.max(axis=1)
+    speed = np.abs(np.diff(angle_series, axis=1))
+    features = np.concatenate([
+        series.mean(axis=1), series.std(axis=1), low, high, high - low, series[:, -1],
+        speed.mean(axis=1), speed.max(axis=1),
+    ], axis=1)
+    return features.astype(np.float32)
@@ -1,30 +1,22 @@
 
 import cv2
 import mediapipe as mp
-import numpy as np
-import pandas as pd
 import time
 import os
 from datetime import datetime
+from core.landmarks import landmarks_into
+from core.recording import LandmarkRecorder, RECORDING_EXTENSION
 
 mp_pose = mp.solutions.pose
 pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
 mp_drawing = mp.solutions.drawing_utils
 
-os.makedirs("collected_data", exist_ok=True)
+# The directory the workout classifier trains on; pass another (e.g. data/collected_data_goodbad) for form labels.
+OUTPUT_DIR = "data/collected_data"
 
-def extract_landmarks(landmarks):
-    """
-    Flattens 33 pose landmarks into a list of 99 values: [x1, y1, z1, x2, y2, z2, ..., x33, y33, z33]
-    """
-    data = []
-    for lm in landmarks.landmark:
-        data.extend([lm.x, lm.y, lm.z])
-    return data
-
-def collect_data(label, duration=5):
+def collect_data(label, duration=5, output_dir=OUTPUT_DIR):
     cap = cv2.VideoCapture(0)
-    data = []
+    path = os.path.join(output_dir, f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{RECORDING_EXTENSION}")
 
     print(f"Starting collection for label: '{label}'")
     print(f"Collecting for {duration} seconds. Get ready...")
@@ -33,43 +25,34 @@ def collect_data(label, duration=5):
 
     start_time = time.time()
 
-    while time.time() - start_time < duration:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(image)
-
-        if results.pose_landmarks:
-            features = extract_landmarks(results.pose_landmarks)
-            features.append(label)
-            data.append(features)
-
-            image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            mp_drawing.draw_landmarks(
-                image_bgr, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-            cv2.imshow('Collecting Data', image_bgr)
-        else:
-            cv2.imshow('Collecting Data', frame)
-
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
-
-    df = pd.DataFrame(data)
-
-    flattened_columns = [f'{coord}{i}' for i in range(33) for coord in ['x', 'y', 'z']]
-    flattened_columns.append('label')
-    df.columns = flattened_columns
-    flattened_columns.append('label')
-    df.columns = flattened_columns
-
-    filename = f"collected_data/{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    df.to_csv(filename, index=False)
-    print(f"💾 Data saved to {filename} with {len(df)} frames.")
+    try:
+        # Frames are appended to disk in chunks by a background thread as they are captured.
+        with LandmarkRecorder(path, label) as recorder:
+            while time.time() - start_time < duration:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                captured_at = time.time()
+
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                results = pose.process(image)
+
+                if results.pose_landmarks:
+                    row, visibility = recorder.next_frame(captured_at)
+                    landmarks_into(results.pose_landmarks, row, visibility)
+
+                    mp_drawing.draw_landmarks(
+                        frame, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
+                cv2.imshow('Collecting Data', frame)
+
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+    finally:
+        # Also runs when capture raises, after the recorder has marked the recording incomplete.
+        cap.release()
+        cv2.destroyAllWindows()
+
+    print(f"💾 Data saved to {path} with {recorder.frames} frames.")
 
 if __name__ == "__main__":
     label = input(" Enter workout label (e.g., pushup, squat, etc.): ").strip().lower()
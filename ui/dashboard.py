@@ -5,13 +5,17 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from datetime import date, datetime, timedelta
-from firebase_admin import firestore
 from firebase_client import db
+from utils.workout_store import (
+    get_days, cached_days, last_days, range_days, day_stats, form_totals
+)
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 import mplcursors
 
 from ui.main_window import FitnessApp
+from ui.loader import BackgroundLoader
+from utils.session_journal import start_sync
 
 class Dashboard(QWidget):
     def __init__(self, user_id, display_name):
@@ -395,19 +399,53 @@ class Dashboard(QWidget):
             }
         """)
 
-        # Load initial data
+        # Load initial data on worker threads; each view shows a placeholder until its data arrives.
+        self.loader = BackgroundLoader()
+        # Sessions recorded while offline (or before the app last closed) sync in the background.
+        start_sync()
         self.update_stats_view()
-        self.load_and_plot_weekly_summary()
-        self.load_and_plot_weekly_line()
-        self.load_and_plot_weekly_bar()
+        self.load_weekly_views()
         self.draw_form_pie_chart("day")
 
-    def update_stats_view(self):
+    def _load(self, key, days, on_done, placeholder):
+        """
+        Calls on_done({date: document}) for the days: right away if they are all
+        cached, otherwise after a worker has fetched them, with placeholder(text)
+        shown meanwhile. A newer _load with the same key replaces a pending one.
+        """
+        docs = cached_days(self.user_id, days)
+        if docs is not None:
+            self.loader.cancel(key)
+            on_done(docs)
+            return
+        placeholder("Loading...")
+        self.loader.request(key, lambda: get_days(self.user_id, days, client=db), on_done,
+                            lambda error: placeholder("Couldn't load data"))
+
+    def _chart_placeholder(self, ax, canvas, text):
+        ax.clear()
+        ax.text(0.5, 0.5, text, ha="center", va="center", color="#B0B0B0", fontsize=12, transform=ax.transAxes)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        canvas.draw_idle()
+
+    def update_stats_view(self, days=None):
         date_str = self.current_date.strftime("%B %d, %Y")
         self.date_label.setText(date_str)
 
-        stats = self.get_stats_for_date(self.current_date)
+        day = self.current_date
+        self._load("day", days or [day], lambda docs: self.show_day_stats(day_stats(docs[day])),
+                   self._day_placeholder)
+
+    def _day_placeholder(self, text):
+        self.reps_label.setText(text)
+        for lbl in (
+            self.pushups_label, self.squats_label, self.curls_label, self.situps_label,
+            self.plank_label, self.calories_label, self.duration_label
+        ):
+            lbl.setText("")
 
+    def show_day_stats(self, stats):
         self.reps_label.setText(f"Reps: {stats.get('reps', 0)}")
         self.pushups_label.setText(f"Pushups: {stats.get('pushups', 0)}")
         self.squats_label.setText(f"Squats: {stats.get('squats', 0)}")
@@ -417,110 +455,58 @@ class Dashboard(QWidget):
         self.calories_label.setText(f"Calories Burned: {stats.get('calories', 0)}")
         self.duration_label.setText(f"Duration: {stats.get('duration', 0)} min")
 
-    def get_stats_for_date(self, date):
-        date_str = date.strftime("%Y-%m-%d")
-        doc_id = f"{self.user_id}_{date_str}"
-        doc_ref = db.collection('workout_data').document(doc_id)
-        doc = doc_ref.get()
-
-        if doc.exists:
-            data = doc.to_dict()
-            pushups = data.get("pushups", 0)
-            situps = data.get("situps", 0)
-            squats = data.get("squats", 0)
-            curls = data.get("curls", 0)
-            reps = pushups + situps + squats + curls
-            return {
-                "reps": reps,
-                "pushups": pushups,
-                "situps": situps,
-                "squats": squats,
-                "curls": curls,
-                "plank_time": data.get("plank_time", 0),
-                "calories": data.get("calories", 0),
-                "duration": data.get("duration", 0)
-            }
-        else:
-            return {
-                "reps": 0,
-                "pushups": 0,
-                "situps": 0,
-                "squats": 0,
-                "curls": 0,
-                "plank_time": 0,
-                "calories": 0,
-                "duration": 0
-            }
-
-    def get_form_quality_data(self, range_type):
-        db = firestore.client()
-        today = datetime.today().date()
-
-        if range_type == "day":
-            date_list = [today]
-        elif range_type == "week":
-            date_list = [today - timedelta(days=i) for i in range(7)]
-        elif range_type == "month":
-            date_list = [today - timedelta(days=i) for i in range(30)]
-        else:
-            return {}
-
-        form_summary = {
-            "pushups": {"good": 0, "bad": 0},
-            "squats": {"good": 0, "bad": 0},
-            "situps": {"good": 0, "bad": 0},
-            "curls": {"good": 0, "bad": 0}
-        }
-
-        for dt in date_list:
-            date_str = dt.strftime("%Y-%m-%d")
-            doc_id = f"{self.user_id}_{date_str}"
-            doc = db.collection("workout_data").document(doc_id).get()
-            if doc.exists:
-                data = doc.to_dict()
-                for workout in form_summary.keys():
-                    form_summary[workout]["good"] += data.get(f"{workout}_good", 0)
-                    form_summary[workout]["bad"] += data.get(f"{workout}_bad", 0)
-
-        return form_summary
-
     def load_previous_day(self):
         self.current_date -= timedelta(days=1)
-        self.update_stats_view()
+        # Fetching the week up to this day keeps the next few steps back in the cache.
+        self.update_stats_view(last_days(7, self.current_date))
 
     def load_next_day(self):
         self.current_date += timedelta(days=1)
         self.update_stats_view()
 
     def launch_main_app(self):
+        self.loader.shutdown()
         self.fitness_app = FitnessApp(user_id=self.user_id)
         self.fitness_app.show()
         self.close()
 
-    def load_and_plot_weekly_summary(self):
-        today = datetime.today().date()
+    def closeEvent(self, event):
+        self.loader.shutdown()
+        super().closeEvent(event)
+
+    def load_weekly_views(self):
+        """Weekly summary card, line and bar charts, all from one fetch of the last 7 days."""
+        self._load("week", last_days(7), self.show_weekly_views, self._weekly_placeholder)
+
+    def _weekly_placeholder(self, text):
+        self.weekly_reps_label.setText(f"Total Reps: {text}")
+        self.weekly_calories_label.setText(f"Calories Burned: {text}")
+        self.weekly_duration_label.setText(f"Duration: {text}")
+        self._chart_placeholder(self.line_ax, self.line_canvas, text)
+        self._chart_placeholder(self.bar_ax, self.bar_canvas, text)
+
+    def show_weekly_views(self, docs):
+        self.plot_weekly_summary(docs)
+        data = self.weekly_data(docs)
+        self.plot_weekly_line(data)
+        self.plot_weekly_bar(data)
+
+    def plot_weekly_summary(self, docs):
         reps_total = 0
         calories_total = 0
         duration_total = 0
 
-        for i in range(7):
-            dt = today - timedelta(days=i)
-            date_str = dt.strftime("%Y-%m-%d")
-            doc_id = f"{self.user_id}_{date_str}"
-            doc_ref = db.collection('workout_data').document(doc_id)
-            doc = doc_ref.get()
-            if doc.exists:
-                d = doc.to_dict()
-                reps_total += d.get("reps", 0)
-                calories_total += d.get("calories", 0)
-                duration_total += d.get("duration", 0)
+        for d in docs.values():
+            stats = day_stats(d)
+            reps_total += stats["reps"]
+            calories_total += stats["calories"]
+            duration_total += stats["duration"]
 
         self.weekly_reps_label.setText(f"Total Reps: {reps_total}")
-        self.weekly_calories_label.setText(f"Calories Burned: {calories_total}")
+        self.weekly_calories_label.setText(f"Calories Burned: {round(calories_total, 1)}")
         self.weekly_duration_label.setText(f"Duration: {duration_total} min")
 
-    def load_and_plot_weekly_line(self):
-        data = self.load_weekly_data()
+    def plot_weekly_line(self, data):
         self.line_ax.clear()
         days = [d["day"] for d in data]
         reps = [d["reps"] for d in data]
@@ -560,13 +546,11 @@ class Dashboard(QWidget):
 
         self.line_canvas.draw()
 
-    def load_weekly_data(self):
+    def weekly_data(self, docs):
         data = []
-        today = datetime.today()
-        for i in range(6, -1, -1):
-            day_date = today - timedelta(days=i)
+        for day_date, doc in docs.items():
             day_str = day_date.strftime("%a")
-            stats = self.get_stats_for_date(day_date)
+            stats = day_stats(doc)
             details = {
                 "pushups": stats["pushups"],
                 "situps": stats["situps"],
@@ -583,9 +567,14 @@ class Dashboard(QWidget):
 
     def display_calendar_stats(self):
         selected_date = self.calendar.selectedDate().toPyDate()
-        stats = self.get_stats_for_date(selected_date)
+        title = f"Stats for {selected_date.strftime('%b %d, %Y')}"
+        self._load("calendar", [selected_date],
+                   lambda docs: self.show_calendar_stats(title, day_stats(docs[selected_date])),
+                   lambda text: self.calendar_info_label.setText(f"{title}:\n{text}"))
+
+    def show_calendar_stats(self, title, stats):
         text = (
-            f"Stats for {selected_date.strftime('%b %d, %Y')}:\n"
+            f"{title}:\n"
             f"Reps: {stats.get('reps', 0)}\n"
             f"Pushups: {stats.get('pushups', 0)}\n"
             f"Squats: {stats.get('squats', 0)}\n"
@@ -597,8 +586,7 @@ class Dashboard(QWidget):
         )
         self.calendar_info_label.setText(text)
 
-    def load_and_plot_weekly_bar(self):
-        data = self.load_weekly_data()
+    def plot_weekly_bar(self, data):
         self.bar_ax.clear()
         days = [d["day"] for d in data]
         reps = [d["reps"] for d in data]
@@ -633,25 +621,13 @@ class Dashboard(QWidget):
         self.bar_canvas.draw()
 
     def draw_form_pie_chart(self, range_type):
-        from_date = datetime.today().date()
-        if range_type == "day":
-            dates = [from_date]
-        elif range_type == "week":
-            dates = [from_date - timedelta(days=i) for i in range(7)]
-        elif range_type == "month":
-            dates = [from_date - timedelta(days=i) for i in range(30)]
-
-        good = {"pushups": 0, "curls": 0, "situps": 0, "squats": 0}
-        bad = {"pushups": 0, "curls": 0, "situps": 0, "squats": 0}
-
-        for d in dates:
-            doc_id = f"{self.user_id}_{d.strftime('%Y-%m-%d')}"
-            doc = db.collection("workout_data").document(doc_id).get()
-            if doc.exists:
-                data = doc.to_dict()
-                for k in good:
-                    good[k] += data.get(f"{k}_good", 0)
-                    bad[k] += data.get(f"{k}_bad", 0)
+        self._load("form", range_days(range_type),
+                   lambda docs: self.plot_form_pie(range_type, form_totals(docs)),
+                   lambda text: self._chart_placeholder(self.form_ax, self.form_canvas, text))
+
+    def plot_form_pie(self, range_type, totals):
+        good = {k: totals[k]["good"] for k in ("pushups", "curls", "situps", "squats")}
+        bad = {k: totals[k]["bad"] for k in ("pushups", "curls", "situps", "squats")}
 
         self.form_ax.clear()
         total_good = sum(good.values())
@@ -0,0 +1,99 @@
+# ui/loader.py
+"""
+Runs blocking data fetches (Firestore reads) off the Qt UI thread.
+
+    self.loader = BackgroundLoader()
+    self.loader.request('week', lambda: get_days(user_id, last_days(7)), self.show_week, self.show_week_error)
+
+fetch runs on a thread pool; on_done(result) / on_error(exception) are
+called on the UI thread through a queued signal. Requests are keyed: a new
+request for a key supersedes the pending one, and cancel() supersedes
+everything. Superseded requests that haven't started are skipped, and the
+results of ones already running are dropped when they arrive (a Firestore
+call in flight can't be interrupted).
+
+Jobs run on QThreadPool.globalInstance() and the loader has no Qt parent, so
+closing the widget that uses it never waits for a fetch in flight: running
+jobs keep the loader alive until they finish, and after shutdown() their
+results are ignored.
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class _Job(QRunnable):
+    def __init__(self, loader, key, generation, fetch):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.generation = generation
+        self.fetch = fetch
+
+    def run(self):
+        if not self.loader.is_current(self.key, self.generation):
+            return
+        try:
+            result = self.fetch()
+        except Exception as e:
+            self.loader._failed.emit(self.key, self.generation, e)
+        else:
+            self.loader._finished.emit(self.key, self.generation, result)
+
+
+class BackgroundLoader(QObject):
+    _finished = pyqtSignal(str, int, object)
+    _failed = pyqtSignal(str, int, object)
+
+    def __init__(self):
+        super().__init__()
+        self._closed = False
+        self._generations = {}
+        self._callbacks = {}
+        # The loader lives on the UI thread, so these are queued when emitted from a worker.
+        self._finished.connect(self._deliver)
+        self._failed.connect(self._deliver_error)
+
+    def request(self, key, fetch, on_done, on_error=None):
+        if self._closed:
+            return
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._callbacks[key] = (on_done, on_error)
+        QThreadPool.globalInstance().start(_Job(self, key, generation, fetch))
+
+    def is_current(self, key, generation):
+        return not self._closed and self._generations.get(key) == generation
+
+    def pending(self, key):
+        return key in self._callbacks
+
+    def cancel(self, key=None):
+        """Drops the pending request for key, or every pending request."""
+        for k in ([key] if key is not None else list(self._generations)):
+            self._generations[k] = self._generations.get(k, 0) + 1
+            self._callbacks.pop(k, None)
+
+    def shutdown(self):
+        """cancel() for good: queued jobs are skipped, running ones finish in the background unheard."""
+        self._closed = True
+        self.cancel()
+
+    def _take(self, key, generation):
+        if not self.is_current(key, generation):
+            return None
+        return self._callbacks.pop(key, None)
+
+    @pyqtSlot(str, int, object)
+    def _deliver(self, key, generation, result):
+        callbacks = self._take(key, generation)
+        if callbacks:
+            callbacks[0](result)
+
+    @pyqtSlot(str, int, object)
+    def _deliver_error(self, key, generation, error):
+        callbacks = self._take(key, generation)
+        if callbacks is None:
+            return
+        print(f"Error loading dashboard {key} data: {error}")
+        if callbacks[1] is not None:
+            callbacks[1](error)
@@ -0,0 +1,217 @@
+# utils/session_journal.py
+"""
+Offline-first workout saves.
+
+record_session() commits a finished session to a local SQLite journal and
+returns straight away; a background thread syncs pending sessions to
+Firestore:
+
+- up to SYNC_BATCH sessions per commit. Each session is two writes in one
+  WriteBatch: batch.create() of a marker document workout_sessions/<session id>
+  and the day document's increments (utils.data_logger.workout_increments);
+- the marker makes a session that was already committed (say the app died
+  between the commit and updating the journal) fail with AlreadyExists instead
+  of being counted twice. A batch that hits one is retried a session at a
+  time so the others still go through;
+- after a failed sync the worker backs off exponentially, up to MAX_BACKOFF
+  seconds, and a new session wakes it up again.
+
+Sessions that never reached Firestore stay in the journal and are synced the
+next time the app runs (the dashboard calls start_sync()).
+"""
+
+import contextlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+
+from utils import workout_store
+from utils.data_logger import workout_increments
+
+JOURNAL_PATH = os.path.join('data', 'session_journal.sqlite3')
+SESSIONS_COLLECTION = "workout_sessions"
+SYNC_BATCH = 200            # two writes per session; Firestore allows 500 per batch
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 300.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    synced_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_pending ON sessions (synced_at, created_at);
+"""
+
+
+def _day(day_str):
+    return datetime.strptime(day_str, '%Y-%m-%d').date()
+
+
+class SessionJournal:
+    def __init__(self, path=JOURNAL_PATH, client=None):
+        self.path = path
+        self.client = client
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connection(self):
+        """A short-lived connection per call (so threads never share one), committed on success."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, user_id, reps_dict, calories, duration, plank_time=None):
+        """Durably stores a finished session and returns its id; syncing happens in the background."""
+        session_id = uuid.uuid4().hex
+        payload = {'reps': dict(reps_dict), 'calories': calories, 'duration': duration, 'plank_time': plank_time or 0}
+        with self._connection() as conn:
+            conn.execute("INSERT INTO sessions (id, user_id, day, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                         (session_id, user_id, datetime.today().strftime('%Y-%m-%d'),
+                          json.dumps(payload, default=float), time.time()))
+        self.start_sync()
+        self._wake.set()
+        return session_id
+
+    def pending(self, limit=SYNC_BATCH):
+        """[(id, user_id, day, payload dict)] of unsynced sessions, oldest first."""
+        with self._connection() as conn:
+            rows = conn.execute("SELECT id, user_id, day, payload FROM sessions WHERE synced_at IS NULL "
+                                "ORDER BY created_at LIMIT ?", (limit,)).fetchall()
+        return [(i, user_id, day, json.loads(payload)) for i, user_id, day, payload in rows]
+
+    def pending_count(self):
+        with self._connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM sessions WHERE synced_at IS NULL").fetchone()[0]
+        return count
+
+    def _mark(self, sql, params):
+        with self._connection() as conn:
+            conn.executemany(sql, params)
+
+    def _add_session(self, batch, client, session):
+        session_id, user_id, day, payload = session
+        batch.create(client.collection(SESSIONS_COLLECTION).document(session_id),
+                     {'user_id': user_id, 'day': day, 'synced_at': firestore.SERVER_TIMESTAMP})
+        day_ref = client.collection(workout_store.COLLECTION).document(workout_store.doc_id(user_id, _day(day)))
+        batch.set(day_ref, workout_increments(payload['reps'], payload['calories'], payload['duration'],
+                                              payload['plank_time']), merge=True)
+
+    def _commit(self, client, sessions):
+        batch = client.batch()
+        for session in sessions:
+            self._add_session(batch, client, session)
+        batch.commit()
+
+    def sync_once(self):
+        """
+        Commits one batch of pending sessions. Returns how many were synced;
+        raises if Firestore couldn't be reached.
+        """
+        sessions = self.pending()
+        if not sessions:
+            return 0
+        client = self.client or firestore.client()
+        try:
+            self._commit(client, sessions)
+        except AlreadyExists:
+            # At least one was synced before; commit them one by one so the rest still count.
+            for session in sessions:
+                try:
+                    self._commit(client, [session])
+                except AlreadyExists:
+                    pass
+        now = time.time()
+        self._mark("UPDATE sessions SET synced_at = ?, last_error = NULL WHERE id = ?",
+                   [(now, session[0]) for session in sessions])
+        for _, user_id, day, _ in sessions:
+            workout_store.cache.invalidate(user_id, _day(day))
+        return len(sessions)
+
+    def _sync_loop(self):
+        backoff = 0.0
+        while not self._stop.is_set():
+            try:
+                synced = self.sync_once()
+            except Exception as e:
+                backoff = min(max(backoff * 2, MIN_BACKOFF), MAX_BACKOFF)
+                print(f"Workout sync failed ({e}); retrying in {backoff:.0f} s")
+                self._mark("UPDATE sessions SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                           [(str(e), session[0]) for session in self.pending()])
+                # Jitter keeps several app instances from retrying in lockstep.
+                self._wake.wait(backoff * random.uniform(0.5, 1.0))
+                self._wake.clear()
+                continue
+            backoff = 0.0
+            if synced == SYNC_BATCH:
+                continue
+            self._wake.wait()
+            self._wake.clear()
+
+    def start_sync(self):
+        """Starts the background sync thread (once); it first drains whatever is pending."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._sync_loop, name="session-sync", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout=10.0):
+        """Waits up to timeout seconds for the journal to drain; True if nothing is pending."""
+        self.start_sync()
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        while self.pending_count():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.1)
+        return True
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = SessionJournal()
+        return _journal
+
+
+def record_session(user_id, reps_dict, calories, duration, plank_time=None):
+    """Drop-in for save_workout_data that never blocks on the network."""
+    return journal().record(user_id, reps_dict, calories, duration, plank_time)
+
+
+def start_sync():
+    journal().start_sync()
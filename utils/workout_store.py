@@ -0,0 +1,171 @@
+# utils/workout_store.py
+"""
+Reads of the per-day workout documents (workout_data/<user_id>_<YYYY-MM-DD>,
+written by utils.data_logger.save_workout_data).
+
+get_days fetches any number of days with one batched get_all round trip
+instead of one document get() per day; everything else here is built on it.
+Documents are kept in an in-process cache (`cache`): days before today no
+longer change and stay cached until evicted, today's entry expires after
+CACHE_TTL seconds, and save_workout_data drops the day it writes.
+
+    docs = get_days(user_id, last_days(7))      # {date: dict or None}, oldest first
+    stats = day_stats(docs[date.today()])
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from firebase_admin import firestore
+
+COLLECTION = "workout_data"
+EXERCISES = ("pushups", "squats", "curls", "situps")
+RANGE_DAYS = {"day": 1, "week": 7, "month": 30}
+CACHE_TTL = 60.0
+CACHE_SIZE = 1024
+
+
+def _as_date(day):
+    return day.date() if isinstance(day, datetime) else day
+
+
+def doc_id(user_id, day):
+    return f"{user_id}_{_as_date(day).strftime('%Y-%m-%d')}"
+
+
+def last_days(n, today=None):
+    """The n days ending today, oldest first."""
+    today = _as_date(today or date.today())
+    return [today - timedelta(days=i) for i in range(n - 1, -1, -1)]
+
+
+def range_days(range_type, today=None):
+    """Days covered by a dashboard range ('day', 'week' or 'month'), oldest first."""
+    return last_days(RANGE_DAYS[range_type], today)
+
+
+class DayCache:
+    """
+    LRU cache of workout documents keyed by (user_id, date), None for days
+    without a document. Entries for days before today never expire; today's
+    (and later) expire ttl seconds after they were stored. Thread-safe.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, day):
+        """(True, document) for a fresh entry, (False, None) otherwise."""
+        key = (user_id, _as_date(day))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, user_id, day, data):
+        day = _as_date(day)
+        expires = None if day < date.today() else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[(user_id, day)] = (data, expires)
+            self._entries.move_to_end((user_id, day))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id, day=None):
+        """Drops one day of a user, or all of the user's days."""
+        with self._lock:
+            if day is not None:
+                self._entries.pop((user_id, _as_date(day)), None)
+            else:
+                for key in [k for k in self._entries if k[0] == user_id]:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = DayCache()
+
+
+def _fetch(user_id, days, client):
+    ids = {doc_id(user_id, d): d for d in days}
+    refs = [client.collection(COLLECTION).document(i) for i in ids]
+    # get_all returns the snapshots in no particular order.
+    found = {snap.id: snap.to_dict() for snap in client.get_all(refs) if snap.exists}
+    return {d: found.get(i) for i, d in ids.items()}
+
+
+def get_days(user_id, days, client=None, use_cache=True):
+    """
+    {date: document dict, or None if there is no document} for the given days,
+    in the order given. Days not in the cache are fetched in a single batched
+    read. The returned dicts are shared with the cache; don't modify them.
+    """
+    days = [_as_date(d) for d in days]
+    docs = {}
+    missing = []
+    for d in days:
+        hit, data = cache.get(user_id, d) if use_cache else (False, None)
+        if hit:
+            docs[d] = data
+        else:
+            missing.append(d)
+    if missing:
+        fetched = _fetch(user_id, missing, client or firestore.client())
+        for d, data in fetched.items():
+            cache.put(user_id, d, data)
+        docs.update(fetched)
+    return {d: docs[d] for d in days}
+
+
+def cached_days(user_id, days):
+    """Like get_days, but from the cache only: None unless every day is cached."""
+    docs = {}
+    for d in days:
+        hit, data = cache.get(user_id, d)
+        if not hit:
+            return None
+        docs[_as_date(d)] = data
+    return docs
+
+
+def get_day(user_id, day, client=None):
+    return get_days(user_id, [day], client)[_as_date(day)]
+
+
+def day_stats(data):
+    """The dashboard's per-day numbers from a workout document (or None)."""
+    data = data or {}
+    stats = {k: data.get(k, 0) for k in EXERCISES}
+    stats["reps"] = sum(stats.values())
+    stats["plank_time"] = data.get("plank_time", 0)
+    # Stored totals are sums of float increments, so they carry binary rounding error.
+    stats["calories"] = round(data.get("calories", 0), 1)
+    stats["duration"] = data.get("duration", 0)
+    return stats
+
+
+def form_totals(docs):
+    """{exercise: {'good': n, 'bad': n}} summed over the documents of get_days."""
+    totals = {k: {"good": 0, "bad": 0} for k in EXERCISES}
+    for data in docs.values():
+        if data:
+            for k in EXERCISES:
+                totals[k]["good"] += data.get(f"{k}_good", 0)
+                totals[k]["bad"] += data.get(f"{k}_bad", 0)
+    return totals